@@ -0,0 +1,44 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 排序算法可视化包
+
+# 各子模块在首次访问对应的名字时才导入（模块级 __getattr__）：
+# - 用 python -m sorting.<模块> 运行某个演示时，导入包不会提前导入该模块，不再触发 runpy 的 RuntimeWarning；
+# - 只用到一个算法时不必导入全部算法（以及 parallel_sort 引入的多进程模块）。
+
+import importlib
+
+# 名字 -> 所在的子模块
+_EXPORTS = {
+    'SortTrace': 'trace',
+    'TraceStream': 'trace',
+    'SortVisualizer': 'visualizer',
+    'BubbleSort': 'bubble_sort',
+    'InsertionSortVisualizer': 'insertion_sort',
+    'MergeSortVisualizer': 'merge_sort',
+    'QuickSortVisualizer': 'quick_sort',
+    'CountingSortVisualizer': 'counting_sort',
+    'RadixSortVisualizer': 'radix_sort',
+    'BucketSortVisualizer': 'bucket_sort',
+    'ParallelSortVisualizer': 'parallel_sort',
+    'ExternalMergeSortVisualizer': 'external_sort',
+    'SortRace': 'race',
+    'race': 'race',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value  # 之后直接从模块字典中取，不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
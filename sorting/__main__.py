@@ -0,0 +1,66 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 排序可视化包的命令行入口
+
+# 用法：
+#   python -m sorting --algo quick --n 50                      打开窗口播放
+#   python -m sorting --algo merge --n 100000 --no-render      只排序，输出耗时和操作计数
+#   python -m sorting --algo radix_numpy --n 200 --export radix.gif
+#   python -m sorting --algo bubble --n 300 --no-render --trace-out traces/bubble
+#   python -m sorting --algo quick --n 1000000 --dist median_of_3_killer --no-render
+#
+# 算法见 registry.py，数据分布见 workloads.py。
+# 只有需要打开窗口或导出动画时才导入 Matplotlib，--no-render 的批量排序只需导入 NumPy；
+# 不打开窗口也不保存轨迹时连排序过程都不记录（record=False），只统计操作次数。
+# 记录排序过程时默认使用轨迹缓存，同一组数据（指定 --seed）再次运行时直接读取轨迹，--no-cache 时总是重新排序。
+
+import argparse
+import dataclasses
+import sys
+import time
+
+import numpy as np
+
+from .registry import ALGORITHMS
+from .workloads import DISTRIBUTIONS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sorting', description='排序算法可视化')
+    parser.add_argument('--algo', choices=ALGORITHMS, default='quick', help='排序算法')
+    parser.add_argument('--n', type=int, default=30, help='数据规模')
+    parser.add_argument('--dist', choices=DISTRIBUTIONS, default='random', help='数据分布')
+    parser.add_argument('--seed', type=int, help='随机数种子，默认每次不同')
+    parser.add_argument('--no-render', action='store_true', help='不打开窗口')
+    parser.add_argument('--export', metavar='PATH', help='把动画导出为 GIF/MP4 文件（不打开窗口）')
+    parser.add_argument('--trace-out', metavar='DIR', help='把排序轨迹保存到目录，之后可用 from_trace 播放')
+    parser.add_argument('--max-frames', type=int, help='播放或导出的最多帧数')
+    parser.add_argument('--fps', type=int, default=2, help='导出动画的帧率')
+    parser.add_argument('--renderer', choices=('auto', 'bars', 'columns'), default='auto', help='渲染方式')
+    parser.add_argument('--no-cache', action='store_true', help='不使用轨迹缓存（见 cache.py），总是重新排序')
+    args = parser.parse_args(argv)
+
+    data = DISTRIBUTIONS[args.dist](np.random.default_rng(args.seed), args.n)
+    window = not args.no_render and args.export is None
+    record = window or args.export is not None or args.trace_out is not None
+
+    start = time.perf_counter()
+    visualizer = ALGORITHMS[args.algo](data, record=record, cache=not args.no_cache)
+    elapsed = time.perf_counter() - start
+    counts = ' '.join(f'{key}={value}' for key, value in dataclasses.asdict(visualizer.stats).items())
+    frames = f' frames={len(visualizer.frames)}' if visualizer.frames is not None else ''
+    print(f'{args.algo} n={args.n} {args.dist}: time={elapsed:.4f}s {counts}{frames}')
+
+    if args.trace_out is not None:
+        visualizer.save_trace(args.trace_out)
+    if args.export is not None:
+        visualizer.export(args.export, fps=args.fps, max_frames=args.max_frames, renderer=args.renderer)
+    if window:
+        visualizer.animate(max_frames=args.max_frames, renderer=args.renderer)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
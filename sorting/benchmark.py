@@ -0,0 +1,194 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 七种排序可视化类的性能基准测试
+
+# 用法：
+#   python -m sorting.benchmark --sizes 100 1000 --output result.json
+#   python -m sorting.benchmark --output new.json --compare baseline.json --threshold 0.2
+#
+# 对每种 算法 × 数据规模 × 数据分布 × 运行模式 的组合，记录：
+# - sort_time：构造可视化对象（排序并记录过程）所用的时间，取多次运行的最小值
+# - frames：帧数（stats 模式不记录，为 0）
+# - comparisons / swaps / writes / aux_bytes：算法的操作计数（见 SortStats）
+# - peak_memory：tracemalloc 统计的峰值内存（字节）
+# - render_fps：在 Agg 画布上按 blit 方式绘制前若干帧的速度
+# 结果写成 JSON；指定 --compare 时与基准结果逐项比较，超过阈值的退化会被标出，并以退出码 1 结束。
+# 算法见 registry.py，数据分布见 workloads.py（默认只测 DEFAULT_DISTRIBUTIONS，可用 --dist 选择其他分布）；--render-frames 0 时不导入 Matplotlib。
+
+import argparse
+import dataclasses
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .registry import ALGORITHMS
+from .workloads import DISTRIBUTIONS
+
+DEFAULT_DISTRIBUTIONS = ['random', 'sorted', 'reversed', 'few_unique']
+
+MODES = ('trace', 'stream', 'stats')
+
+# 比较时各指标的“变差”方向：1 表示越大越差，-1 表示越小越差
+METRICS = {'sort_time': 1, 'peak_memory': 1, 'render_fps': -1}
+
+
+def _run(cls, data, mode):
+    """
+    运行一次排序，返回 (可视化对象, 帧数)。
+    """
+    if mode == 'stream':
+        visualizer = cls(data, stream=True)
+        return visualizer, sum(1 for _ in visualizer._stream_frames())
+    if mode == 'stats':
+        # 不记录排序过程，只统计操作次数
+        return cls(data, record=False), 0
+    visualizer = cls(data, cache=False)  # 测量的是排序本身，不能从轨迹缓存中取
+    return visualizer, len(visualizer.frames)
+
+
+def render_fps(visualizer, count):
+    """
+    在 Agg 画布上按 blit 方式绘制前 count 帧，返回每秒帧数。
+    """
+    frames = visualizer.frames
+    count = min(count, len(frames))
+    if count == 0:
+        return None
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from .render import BarRenderer
+
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    renderer = BarRenderer(ax, visualizer.data)
+    for artist in renderer.artists:
+        artist.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    start = time.perf_counter()
+    for k in range(count):
+        artists = visualizer._update(frames[k], renderer)
+        canvas.restore_region(background)
+        for artist in artists:
+            ax.draw_artist(artist)
+    return count / (time.perf_counter() - start)
+
+
+def measure(name, n, dist, mode, repeat=3, render_frames=200, seed=0):
+    """
+    测量一个组合，返回结果字典；排序出错时记录错误信息。
+    """
+    cls = ALGORITHMS[name]
+    data = DISTRIBUTIONS[dist](np.random.default_rng(seed), n)
+    result = {'algorithm': name, 'n': n, 'distribution': dist, 'mode': mode}
+    try:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _run(cls, data, mode)
+            times.append(time.perf_counter() - start)
+        # 统计内存时单独再跑一次，避免 tracemalloc 的开销影响计时
+        tracemalloc.start()
+        visualizer, frames = _run(cls, data, mode)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    except (RecursionError, ValueError, IndexError, ZeroDivisionError, MemoryError) as e:
+        tracemalloc.stop()
+        result['error'] = f'{type(e).__name__}: {e}'
+        return result
+    result.update(sort_time=min(times), frames=frames, peak_memory=peak)
+    result.update(dataclasses.asdict(visualizer.stats))
+    if mode == 'trace' and render_frames:
+        result['render_fps'] = render_fps(visualizer, render_frames)
+    return result
+
+
+def _key(result):
+    return result['algorithm'], result['n'], result['distribution'], result['mode']
+
+
+def compare(results, baseline, threshold):
+    """
+    与基准结果比较，返回退化项列表 [(组合, 指标, 基准值, 当前值, 变化比例)]。
+    """
+    base = {_key(r): r for r in baseline}
+    regressions = []
+    for result in results:
+        old = base.get(_key(result))
+        if old is None:
+            continue
+        for metric, direction in METRICS.items():
+            before, after = old.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * direction
+            if change > threshold:
+                regressions.append((_key(result), metric, before, after, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='排序可视化类的性能基准测试')
+    parser.add_argument('--algo', nargs='+', choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 300, 1000])
+    parser.add_argument('--dist', nargs='+', choices=DISTRIBUTIONS, default=DEFAULT_DISTRIBUTIONS)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=['trace'])
+    parser.add_argument('--repeat', type=int, default=3, help='计时重复次数，取最小值')
+    parser.add_argument('--render-frames', type=int, default=200, help='测量绘制速度的帧数，0 表示不测')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='结果 JSON 文件路径')
+    parser.add_argument('--compare', help='基准结果 JSON 文件路径')
+    parser.add_argument('--threshold', type=float, default=0.2, help='判定为退化的相对变化阈值')
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.algo:
+        for n in args.sizes:
+            for dist in args.dist:
+                for mode in args.modes:
+                    result = measure(name, n, dist, mode, args.repeat, args.render_frames, args.seed)
+                    results.append(result)
+                    if 'error' in result:
+                        print(f'{name:10} n={n:<7} {dist:11} {mode:7} {result["error"]}')
+                    else:
+                        fps = result.get('render_fps')
+                        print(f'{name:10} n={n:<7} {dist:11} {mode:7} '
+                              f'time={result["sort_time"]:.4f}s frames={result["frames"]} '
+                              f'peak={result["peak_memory"] / 2 ** 20:.2f}MiB'
+                              + (f' fps={fps:.1f}' if fps else ''))
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for key, metric, before, after, change in regressions:
+            print(f'退化: {"/".join(map(str, key))} {metric}: {before:.4g} -> {after:.4g} ({change:+.0%})')
+        if regressions:
+            return 1
+        print('未发现超过阈值的退化')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
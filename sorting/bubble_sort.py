@@ -13,64 +13,134 @@
 # 因此总的比较次数为：
 # (n-1) + (n-2) + ... + 1 = n(n-1)/2 ≈ O(n^2)
 #
-# 最好情况下（已排序），仍需执行 n 轮检查，因此最好时间复杂度仍然是 O(n^2)
+# 最好情况下（已排序），第一轮没有发生交换就可以结束，只需 n-1 次比较，最好时间复杂度为 O(n)
+#
+# 优化：
+# - 记录每一轮最后一次交换的位置，它之后的元素都已就位，下一轮只需比较到这里；
+#   某一轮没有发生交换时整个数组已经有序，直接结束。
+# - 双向冒泡（鸡尾酒排序，cocktail=True）：正向一轮把最大值移到右端，反向一轮把最小值移到左端，
+#   两端都按最后一次交换的位置收缩；较小的元素位于末尾时（如 2, 3, ..., n, 1）只需两轮。
+# - 记录级别 level='swaps' 时只记录交换帧，比较次数只计数不记帧，
+#   有序和基本有序的输入只产生很少几帧；
+#   不记录（record=False）时交换也不产生帧，比较和交换次数都在本地累加后整体 tally。
 #
 # 空间复杂度计算：
-# 仅使用了少量额外变量（如 `frames` 列表存储排序过程），但主排序过程是原地进行的，
-# 空间复杂度为 O(n)（由于存储排序过程的多个状态，否则原算法的空间复杂度为 O(1)）。
+# 仅使用了少量额外变量，主排序过程是原地进行的，原算法的空间复杂度为 O(1)。
+# 排序过程记录在 `frames`（SortTrace）中：一份初始快照加上每一步的操作事件，
+# 额外空间与步数成正比，而不是每一步都复制整个数组。
 
-import matplotlib.pyplot as plt
 import numpy as np
-import matplotlib.animation as animation
 
-class BubbleSort:
+from .visualizer import SortVisualizer
+
+class BubbleSort(SortVisualizer):
     '''
     冒泡排序可视化类，提供排序及动画演示功能
     '''
-    def __init__(self, data):
-        self.data = data
-        self.frames=[] #存储每一帧的数据和高亮索引
-        self._bubble_sort()
-    
+    cocktail = False
+    level = 'compare'
+
+    def __init__(self, data, cocktail=False, level='compare', **kwargs):
+        '''
+        :param data: 待排序的数组
+        :param cocktail: 是否使用双向冒泡（鸡尾酒排序）
+        :param level: 记录级别，'compare'（每次比较和交换各一帧）或 'swaps'（只记录交换）
+        :param kwargs: 其余参数见 SortVisualizer
+        '''
+        if level not in ('compare', 'swaps'):
+            raise ValueError(f'未知的记录级别: {level}')
+        self.cocktail = cocktail
+        self.level = level
+        super().__init__(data, **kwargs)
+
+    def _steps(self):
+        if self.cocktail:
+            return self._cocktail_sort()
+        return self._bubble_sort()
+
     def _bubble_sort(self):
         """
-        执行冒泡排序，并记录排序过程。
+        执行冒泡排序，并记录排序过程，返回排好序的数组。
         """
         arr = self.data.copy()
-        n = len(arr)
-        for i in range(n):
-            for j in range(n-i-1):
-                self.frames.append((arr.copy(), j, j+1)) #记录当前状态和比较的索引
+        trace = self.frames.recording #只计数（record=False）时不 yield，交换次数在本地累加
+        record = trace and self.level == 'compare'
+        swaps = 0
+        end = len(arr) - 1 #本轮比较到 arr[end]
+        while end > 0:
+            last = 0 #本轮最后一次交换的位置，之后的元素都已就位
+            for j in range(end):
+                if record:
+                    yield self.frames.compare(j, j+1) #记录比较的索引
                 if arr[j] > arr[j+1]:
                     arr[j], arr[j+1] = arr[j+1], arr[j] #交换元素
-                    self.frames.append((arr.copy(), j, j+1)) #记录交换后的状态
+                    if trace:
+                        yield self.frames.swap(j, j+1) #记录交换
+                    else:
+                        swaps += 1
+                    last = j
+            if not record:
+                self.frames.tally(comparisons=end)
+            end = last #没有发生交换时 last 为 0，排序结束
+        self.frames.tally(swaps=swaps)
+        return arr
 
-    def _update(self, frame_data,ax):
+    def _cocktail_sort(self):
+        """
+        执行双向冒泡排序（鸡尾酒排序），并记录排序过程，返回排好序的数组。
+        """
+        arr = self.data.copy()
+        trace = self.frames.recording
+        record = trace and self.level == 'compare'
+        swaps = 0
+        start, end = 0, len(arr) - 1 #未就位的区间为 [start, end]
+        while start < end:
+            #正向：把最大值移到右端
+            last = start
+            for j in range(start, end):
+                if record:
+                    yield self.frames.compare(j, j+1)
+                if arr[j] > arr[j+1]:
+                    arr[j], arr[j+1] = arr[j+1], arr[j]
+                    if trace:
+                        yield self.frames.swap(j, j+1)
+                    else:
+                        swaps += 1
+                    last = j
+            if not record:
+                self.frames.tally(comparisons=end - start)
+            end = last
+            if start >= end:
+                break
+            #反向：把最小值移到左端
+            last = end
+            for j in range(end - 1, start - 1, -1):
+                if record:
+                    yield self.frames.compare(j, j+1)
+                if arr[j] > arr[j+1]:
+                    arr[j], arr[j+1] = arr[j+1], arr[j]
+                    if trace:
+                        yield self.frames.swap(j, j+1)
+                    else:
+                        swaps += 1
+                    last = j + 1
+            if not record:
+                self.frames.tally(comparisons=end - start)
+            start = last
+        self.frames.tally(swaps=swaps)
+        return arr
+
+    def _style(self, frame_data):
         '''
-        更新动画帧，绘制当前排序状态
+        返回当前帧的绘制方案：(数组, 高亮颜色, 顶部标注, 标题)
         '''
         frame,idx1,idx2 = frame_data
-        ax.clear()
-        bars=ax.bar(range(len(frame)), frame, color=['blue']*len(frame))
-
         #变色高亮当前比较的元素
-        bars[idx1].set_color('red')
-        bars[idx2].set_color('yellow')
+        colors = {idx1: 'red', idx2: 'yellow'}
         #在柱子顶部加星号标注
-        ax.annotate('*',(idx1, frame[idx1]),ha='center', va='bottom',fontsize=12,color='red')
-        ax.annotate('*',(idx2, frame[idx2]),ha='center', va='bottom',fontsize=12,color='red')
-
-        ax.set_ylim(0, max(frame)+1)
+        markers = [(idx1, '*', 'red'), (idx2, '*', 'red')]
+        return frame, colors, markers, None
 
-    def animate(self):
-        '''
-        演示排序过程，并保存为gif动画
-        '''
-        fig, ax = plt.subplots()
-        ani = animation.FuncAnimation(fig, self._update, frames=self.frames, fargs=(ax,), interval=500, repeat=False)
-        # ani.save('bubble_sort.gif', writer='pillow', fps=2)
-        plt.show()
-        
 
 # 示例用法：
 if __name__ == "__main__":
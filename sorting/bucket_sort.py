@@ -9,36 +9,52 @@
 # 基本思想是将数据分配到不同的桶中，然后对每个桶分别进行排序（通常使用插入排序），最后合并所有桶中的元素。
 
 # 算法步骤：
-# 1. 确定桶的数量：根据数据范围和数据量确定桶的数量。
+# 1. 确定桶的数量和边界：根据数据量和数据范围确定桶的数量，按数据的分布确定各桶的边界。
 # 2. 分配到桶中：将数据分配到相应的桶中。
-# 3. 排序每个桶：对每个桶中的元素进行排序（通常使用插入排序）。
-# 4. 合并桶：将所有桶中的元素合并成一个有序数组。
+# 3. 拆分过载的桶：元素过多的桶按同样的方法再分成若干个桶，直到每个桶都足够小（或桶内元素全部相等）。
+# 4. 排序每个桶：对每个桶中的元素进行排序（通常使用插入排序）。
+# 5. 合并桶：将所有桶中的元素合并成一个有序数组。
 
 # 时间复杂度分析：
 # - 平均情况：O(n + k)，其中 n 是输入数组的大小，k 是桶的数量。
-# - 最坏情况：O(n^2)（当所有元素分配到同一个桶中时）。
+# - 最坏情况：均匀划分时为 O(n^2)（当所有元素分配到同一个桶中时）；
+#   按分布划分并拆分过载的桶后，每个桶最多 MAX_LOAD 个元素，桶内排序是常数时间，
+#   整体接近线性，只有数据极度集中时才需要多拆几层。
 # - 最好情况：O(n + k)。
 
 # 空间复杂度分析：
 # - 桶排序需要额外的空间来存储桶，空间复杂度为 O(n + k)。
 
 # 适用场景：
-# - 数据均匀分布。
-# - 数据是非负整数或浮点数。
+# - 数据均匀分布，或分布不均但没有大量重复值之外的极端集中。
+# - 数据是整数或浮点数。
 # - 对时间复杂度要求较高，且数据范围不是特别大。
 
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+# 桶的划分：
+# - 桶的边界取数据（元素较多时取等间隔抽出的至多 SAMPLE_SIZE 个样本）的分位数，
+#   每个桶中的元素个数大致相同，因此偏斜的数据（如指数分布、大量重复值）也能分得均匀；
+# - 桶的数量按平均每桶 BUCKET_LOAD 个元素确定，整数数据不超过取值范围内整数的个数；
+# - 分配时用 np.searchsorted 一次算出所有元素所在的桶；
+# - 拆分用显式的栈而不是递归，不受递归深度限制。所有元素都相等的桶已经有序，不再拆分。
+
 import numpy as np
 
-class BucketSortVisualizer:
+from .visualizer import SortVisualizer
+
+BUCKET_LOAD = 4    # 划分时平均每个桶的元素个数
+MAX_LOAD = 32      # 元素个数超过该值的桶会被继续拆分
+SAMPLE_SIZE = 256  # 计算桶边界时最多使用的样本数
+
+class BucketSortVisualizer(SortVisualizer):
     """
     桶排序可视化类，提供分而治之排序及动画演示功能。
     """
-    def __init__(self, data):
-        self.data = list(data)
-        self.frames = []
-        self._bucket_sort(self.data)
+    init_title = 'Step: 0 - INIT'
+
+    def _steps(self):
+        arr = list(self.data)
+        yield from self._bucket_sort(arr)
+        return arr
 
     def _bucket_sort(self, arr):
         """
@@ -49,92 +65,116 @@ class BucketSortVisualizer:
         if not arr:
             return
 
-        # 找出数组中的最大值和最小值
-        min_value = min(arr)
-        max_value = max(arr)
+        values = np.asarray(arr)
         n = len(arr)
-
-        # 确定桶的数量
-        num_buckets = int(np.sqrt(n))
-        buckets = [[] for _ in range(num_buckets)]
-
-        # 分配到桶中
-        for num in arr:
-            index = int((num - min_value) / (max_value - min_value) * (num_buckets - 1))
-            buckets[index].append(num)
-            self.frames.append((arr.copy(), num, 'bucket'))
+        trace = self.frames.recording  # 只计数（record=False）时不 yield，写入次数整段统计
+        # 桶中存放元素在原数组中的索引，值从 values 中读取
+        nbytes = self.frames.itemsize * n + 8 * n
+        self.frames.alloc(nbytes)
+
+        # 分配到桶中，过载的桶继续拆分；得到按值从小到大排列的各个桶
+        buckets = []
+        stack = [(np.arange(n), True)]
+        while stack:
+            indices, root = stack.pop()
+            bucket = values[indices]
+            low, high = bucket.min(), bucket.max()
+            if low == high or (not root and len(indices) <= MAX_LOAD):
+                buckets.append(indices)
+                continue
+            index = np.searchsorted(self._edges(bucket, low, high), bucket, side='right')
+            self.frames.tally(writes=len(indices))
+            if trace:
+                for i in indices.tolist():
+                    yield self.frames.mark(i, label='bucket')  # 传索引 i，而不是数值 num
+            # 按桶号稳定地分组，逆序入栈，保证先处理值较小的桶
+            order = np.argsort(index, kind='stable')
+            ends = np.cumsum(np.bincount(index))
+            for group in reversed(np.split(indices[order], ends[:-1])):
+                if len(group):
+                    stack.append((group, False))
 
         # 对每个桶进行插入排序
-        for i in range(num_buckets):
+        for i, indices in enumerate(buckets):
+            buckets[i] = values[indices].tolist()
             self._insertion_sort(buckets[i])
-            for num in buckets[i]:
-                self.frames.append((arr.copy(), num, 'sort'))
+            if trace:
+                for j in indices.tolist():
+                    yield self.frames.mark(j, label='sort')  # 传索引 j，而不是数值 num
 
         # 合并桶
+        if not trace:
+            arr[:] = [num for bucket in buckets for num in bucket]
+            self.frames.tally(writes=n)
+            self.frames.free(nbytes)
+            return
         sorted_index = 0
         for bucket in buckets:
             for num in bucket:
                 arr[sorted_index] = num
                 sorted_index += 1
-                self.frames.append((arr.copy(), sorted_index - 1, 'merge'))
+                yield self.frames.write(sorted_index - 1, num, label='merge')
+        self.frames.free(nbytes)
+
+    @staticmethod
+    def _edges(bucket, low, high):
+        """
+        计算把 bucket 分成若干个桶的边界（low < high）。
+
+        :return: 升序的边界数组，元素 x 属于第 searchsorted(edges, x, side='right') 个桶
+        """
+        n = len(bucket)
+        num_buckets = max(-(-n // BUCKET_LOAD), 2)
+        if np.issubdtype(bucket.dtype, np.integer):
+            # 整数数据的桶数不超过取值范围内整数的个数
+            num_buckets = min(num_buckets, int(high) - int(low) + 1)
+        sample = bucket if n <= SAMPLE_SIZE else bucket[::n // SAMPLE_SIZE]
+        # 按样本的分位数划分，每个桶中的元素个数大致相同
+        edges = np.unique(np.quantile(sample, np.linspace(0, 1, num_buckets + 1)[1:-1]))
+        # 边界必须落在 (low, high] 中，才能保证最小值和最大值分在不同的桶，每次拆分都有进展
+        edges = edges[(edges > low) & (edges <= high)]
+        if len(edges) == 0:
+            # 样本几乎都等于最小值：把最小值单独分出来
+            edges = np.array([bucket[bucket > low].min()])
+        return edges
 
     def _insertion_sort(self, arr):
         """
-        对数组进行插入排序，并记录排序过程中的状态。
+        对数组进行插入排序，并统计比较和写入次数。
 
         :param arr: 待排序的数组
         """
+        comparisons = writes = 0
         for i in range(1, len(arr)):
             key = arr[i]
             j = i - 1
             while j >= 0 and key < arr[j]:
                 arr[j + 1] = arr[j]
                 j -= 1
+            # 每次移动前都比较成功了一次，循环因 key >= arr[j] 结束时还多比较了一次
+            comparisons += i - 1 - j + (j >= 0)
+            writes += i - j  # 移动 i - 1 - j 次，再写入 key 一次
             arr[j + 1] = key
+        self.frames.tally(comparisons=comparisons, writes=writes)
 
-    def _update(self, frame_data, ax):
+    def _style(self, frame_data):
         """
-        更新动画帧，绘制当前排序状态。
+        返回当前帧的绘制方案。
 
         :param frame_data: 当前帧的数据
-        :param ax: Matplotlib 的 Axes 对象
+        :return: (数组, 高亮颜色, 顶部标注, 标题)
         """
         frame, idx, action = frame_data
-        ax.clear()
-        bars = ax.bar(range(len(frame)), frame, color=['blue'] * len(frame))
-
-        if 0 <= idx < len(bars):  # 确保 idx 在 bars 可访问范围内
+        colors = {}
+        if 0 <= idx < len(frame):  # 确保 idx 在柱子的索引范围内
             if action == 'bucket':
-                bars[idx].set_color('red')  # 标记分配到桶中的元素
+                colors[idx] = 'red'  # 标记分配到桶中的元素
             elif action == 'sort':
-                bars[idx].set_color('orange')  # 标记桶内排序的元素
+                colors[idx] = 'orange'  # 标记桶内排序的元素
             elif action == 'merge':
-                bars[idx].set_color('green')  # 标记合并桶中的元素
-
-        ax.set_ylim(0, max(self.data) + 1)
-        ax.set_title(f'Step: {len(self.frames)} - {action.upper()}')
-
-    def _init_draw(self, ax):
-        """
-        初始化动画帧。
+                colors[idx] = 'green'  # 标记合并桶中的元素
 
-        :param ax: Matplotlib 的 Axes 对象
-        """
-        ax.clear()
-        bars = ax.bar(range(len(self.data)), self.data, color=['blue'] * len(self.data))
-        ax.set_ylim(0, max(self.data) + 1)
-        ax.set_title('Step: 0 - INIT')
-        return bars
-
-    def animate(self):
-        """
-        运行动画，展示排序过程。
-        """
-        fig, ax = plt.subplots()
-        ani = animation.FuncAnimation(fig, self._update, frames=self.frames, 
-                                      init_func=lambda: self._init_draw(ax), 
-                                      fargs=(ax,), interval=500, repeat=False)
-        plt.show()
+        return frame, colors, [], f'Step: {len(self.frames)} - {action.upper()}'
 
 if __name__ == "__main__":
     data = np.random.randint(1, 200, 10)  # 生成 10 个随机整数，范围在 1 到 200 之间
@@ -0,0 +1,239 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 按内容寻址的排序轨迹缓存（进程内 LRU + 磁盘缓存）
+
+# 设计思路：
+# 可视化对象在构造时就完成整个排序并记录全部事件，生成文档和演示时同一组数据、同一个算法会被反复构造，
+# 每次都要重新排序。轨迹只由 算法 + 算法参数 + 输入数据 决定，因此可以按内容缓存：
+# - 键：算法类名、算法所在各模块源代码的摘要（修改算法后旧的缓存自然失效）、
+#   子类在构造时设置的参数（如 engine、radix），以及输入数组的 dtype、形状和全部字节，用 BLAKE2b 摘要；
+# - 进程内：OrderedDict 实现的 LRU，直接复用轨迹对象，总字节数超过 memory_limit 时淘汰最久未用的条目；
+# - 磁盘：每个键一个目录，内容就是 SortTrace.save 的输出加上 result.npy，命中时以内存映射方式打开，
+#   只需读取元数据，与轨迹长度无关；目录的修改时间即最近使用时间，总大小超过 disk_limit 时删除最久未用的目录。
+# 写入磁盘时先写到临时目录再整体改名，多个进程同时写入同一个键也不会读到写了一半的条目。
+# 磁盘不可写时只使用进程内缓存，不影响排序本身。
+# 结果依赖运行环境或有副作用的可视化类（如并行排序、外部排序）设置 cacheable = False，不参与缓存。
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from .trace import SortTrace
+
+MEMORY_LIMIT = 256 * 2 ** 20  # 进程内缓存的字节数上限
+DISK_LIMIT = 2 ** 30          # 磁盘缓存的字节数上限
+KEY_LENGTH = 40               # 缓存键（十六进制摘要）的长度
+
+# 磁盘缓存的默认目录；环境变量 SORTING_CACHE_DIR 设为空字符串时只使用进程内缓存
+CACHE_DIR = os.environ.get('SORTING_CACHE_DIR', os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'sorting')) or None
+
+_sources = {}  # 类 -> 所在各模块源代码的摘要
+
+
+def _source_digest(cls):
+    """
+    返回 cls 及其各基类所在模块（本包内）和 trace 模块源代码的摘要。
+    """
+    if cls not in _sources:
+        h = hashlib.blake2b(digest_size=16)
+        modules = [c.__module__ for c in cls.__mro__] + [SortTrace.__module__]
+        for name in dict.fromkeys(modules):
+            path = getattr(sys.modules.get(name), '__file__', None)
+            if name.split('.')[0] == __name__.split('.')[0] and path:
+                with open(path, 'rb') as f:
+                    h.update(f.read())
+        _sources[cls] = h.digest()
+    return _sources[cls]
+
+
+def _is_key(name):
+    return len(name) == KEY_LENGTH and all(c in '0123456789abcdef' for c in name)
+
+
+def _trace_bytes(trace, result):
+    """
+    轨迹（事件、初始快照、整段写入的数据）和结果占用的字节数。
+    """
+    blocks = trace.blocks
+    nbytes = blocks.nbytes if isinstance(blocks, np.ndarray) else sum(block.nbytes for block in blocks)
+    return trace.events.nbytes + trace.initial.nbytes + nbytes + np.asarray(result).nbytes
+
+
+class TraceCache:
+    """
+    排序轨迹缓存：先查进程内的 LRU，再查磁盘，都按最近使用的顺序淘汰。
+    """
+    def __init__(self, directory=CACHE_DIR, memory_limit=MEMORY_LIMIT, disk_limit=DISK_LIMIT):
+        """
+        :param directory: 磁盘缓存的目录，为 None 时只使用进程内缓存
+        :param memory_limit: 进程内缓存的字节数上限
+        :param disk_limit: 磁盘缓存的字节数上限
+        """
+        self.directory = directory
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # 键 -> (轨迹, 结果, 字节数)
+        self._memory_bytes = 0
+
+    @staticmethod
+    def key(cls, options, data):
+        """
+        计算缓存键；数据不是数值数组（无法按字节寻址）时返回 None。
+
+        :param cls: 可视化类
+        :param options: 子类设置的算法参数 {名字: 值}
+        :param data: 输入数据
+        """
+        arr = np.asarray(data)
+        if arr.dtype.hasobject:
+            return None
+        h = hashlib.blake2b(digest_size=KEY_LENGTH // 2)
+        h.update(f'{cls.__module__}.{cls.__qualname__}'.encode())
+        h.update(_source_digest(cls))
+        for name in sorted(options):
+            value = options[name]
+            h.update(name.encode())
+            if isinstance(value, np.ndarray):
+                h.update(f'{value.dtype.str}{value.shape}'.encode())
+                h.update(np.ascontiguousarray(value))
+            else:
+                h.update(repr(value).encode())
+        h.update(f'{arr.dtype.str}{arr.shape}'.encode())
+        h.update(np.ascontiguousarray(arr))
+        return h.hexdigest()
+
+    def get(self, key):
+        """
+        查找缓存，命中时返回 (轨迹, 排好序的数组)，否则返回 None。
+        """
+        entry = self._memory.get(key)
+        if entry is None and self.directory is not None:
+            entry = self._load(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if key in self._memory:
+            self._memory.move_to_end(key)
+        self.hits += 1
+        trace, result, _ = entry
+        # 结果交给调用者修改，每次返回一份副本
+        return trace, list(result) if isinstance(result, list) else np.array(result)
+
+    def put(self, key, trace, result):
+        """
+        把一次排序的轨迹和结果放入进程内缓存和磁盘缓存。
+        """
+        # 与 get 相同，调用者手中的结果可能被修改，缓存中保存一份副本
+        result = list(result) if isinstance(result, list) else np.array(result)
+        nbytes = _trace_bytes(trace, result)
+        self._remember(key, trace, result, nbytes)
+        if self.directory is not None and nbytes <= self.disk_limit:
+            try:
+                self._store(key, trace, result)
+            except OSError:
+                pass  # 磁盘不可写时只保留进程内缓存
+
+    def clear(self):
+        """
+        清空进程内缓存和磁盘缓存。
+        """
+        self._memory.clear()
+        self._memory_bytes = 0
+        if self.directory is not None and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                # 只删除缓存条目（以键命名）和写入中途留下的临时目录
+                if _is_key(name) or name.startswith('.') and _is_key(name[1:KEY_LENGTH + 1]):
+                    shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def _remember(self, key, trace, result, nbytes):
+        """
+        放入进程内缓存，超过上限时淘汰最久未用的条目。
+        """
+        if nbytes > self.memory_limit:
+            return
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[2]
+        self._memory[key] = (trace, result, nbytes)
+        self._memory_bytes += nbytes
+        while self._memory_bytes > self.memory_limit:
+            self._memory_bytes -= self._memory.popitem(last=False)[1][2]
+
+    def _load(self, key):
+        """
+        从磁盘缓存中打开一个条目（内存映射），并更新其最近使用时间；不存在或已损坏时返回 None。
+        """
+        path = os.path.join(self.directory, key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            trace, meta = SortTrace.load(path, mmap=True)
+            result = np.load(os.path.join(path, 'result.npy'))
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        if meta.get('result_list'):
+            result = result.tolist()
+        nbytes = _trace_bytes(trace, result)
+        self._remember(key, trace, result, nbytes)
+        return trace, result, nbytes
+
+    def _store(self, key, trace, result):
+        """
+        写入磁盘缓存：先写到临时目录，再整体改名为键，最后按上限淘汰最久未用的条目。
+        """
+        path = os.path.join(self.directory, key)
+        if os.path.isdir(path):
+            os.utime(path)
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=f'.{key}-', dir=self.directory)
+        try:
+            trace.save(tmp, result_list=isinstance(result, list))
+            np.save(os.path.join(tmp, 'result.npy'), np.asarray(result))
+            os.rename(tmp, path)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isdir(path):  # 其他进程已写入同一个键时不算失败
+                raise
+        self._evict()
+
+    def _evict(self):
+        """
+        磁盘缓存超过上限时，按最近使用时间从旧到新删除条目。
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not _is_key(entry.name) or not entry.is_dir():
+                continue  # 跳过正在写入的临时目录
+            size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+            entries.append((entry.stat().st_mtime, size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_limit:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+
+_default = None
+
+
+def default_cache():
+    """
+    返回默认的轨迹缓存（首次调用时创建，磁盘目录为 CACHE_DIR）。
+    """
+    global _default
+    if _default is None:
+        _default = TraceCache()
+    return _default
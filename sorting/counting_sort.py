@@ -10,8 +10,9 @@
 # 计数排序适用于已知数据范围且数据范围不是特别大的情况。
 
 # 算法步骤：
-# 1. 找出最大值：确定数组中最大的元素，以便确定计数数组的大小。
-# 2. 初始化计数数组：创建一个大小为 max_value + 1 的计数数组，初始值为 0。
+# 1. 找出最小值和最大值：确定数据范围，以便确定计数数组的大小。
+# 2. 初始化计数数组：创建一个大小为 max_value - min_value + 1 的计数数组，初始值为 0，
+#    元素 v 对应的计数器下标为 v - min_value（因此也支持负数）。
 # 3. 统计频率：遍历输入数组，统计每个元素出现的次数，并存储在计数数组中。
 # 4. 累加计数：将计数数组转换为累加计数数组，这样每个元素的值表示该元素在排序后数组中的位置。
 # 5. 构建输出数组：根据累加计数数组，将输入数组中的元素放到正确的位置上。
@@ -25,24 +26,65 @@
 # 空间复杂度分析：
 # - 计数排序需要额外的空间来存储计数数组，空间复杂度为 O(k)。
 
+# 稀疏键空间：
+# 数据范围远大于元素个数时（如 n 个元素中有一个 10⁹），按范围分配计数器会占用大量内存，
+# 并产生同样多的 'accumulate' 帧。范围超过 SPARSE_RATIO × n 时自动改用压缩的键空间：
+# 先取出所有不同的键并排序，每个元素的计数器下标改为它在其中的名次。
+# 计数数组只有 d 个计数器（d 为不同键的个数），空间 O(n + d)，
+# 时间 O(n + d log d)（排序不同的键），与数据范围无关。
+
 # 适用场景：
 # - 数据范围较小且已知。
 # - 数据是非负整数。
 # - 需要稳定的排序算法（即相同元素的相对顺序保持不变）。
 # - 对时间复杂度要求较高，且数据范围不是特别大。
 
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+# NumPy 引擎（engine='numpy'）：
+# 逐元素的 Python 循环在数据量大时很慢，而计数排序的各阶段都能直接向量化：
+# - 统计频率：np.bincount（压缩键空间时由 np.unique 给出名次）；
+# - 累加计数、构建输出数组：计数器 k 对应的元素落在 [累加计数[k] - 计数[k], 累加计数[k]) 中，
+#   待排序的只是整数本身，相同元素无法区分，这两步合起来就是 np.repeat，不必单独求累加计数；
+# - 复制回原数组：输出数组直接作为结果。
+# 初始数据保存为数组（见 _prepare），整个过程不经过 Python 列表，结果也是数组。
+# 记录过程时每个阶段只产生一帧（'count'、'accumulate'、'build'、'copy'），
+# 'build' 和 'copy' 帧用 assign 整段写入，操作计数与逐元素版本完全相同。
+
 import numpy as np
 
-class CountingSortVisualizer:
+from .trace import AUX
+from .visualizer import SortVisualizer
+
+SPARSE_RATIO = 4  # 数据范围超过 元素个数 × SPARSE_RATIO 时改用压缩的键空间
+
+class CountingSortVisualizer(SortVisualizer):
     """
     计数排序可视化类，提供非比较型整数排序及动画演示功能。
     """
-    def __init__(self, data):
-        self.data = list(data)
-        self.frames = []
-        self._counting_sort(self.data)
+    init_title = 'Step: 0 - INIT'
+    engine = 'python'
+
+    def __init__(self, data, engine='python', **kwargs):
+        """
+        :param data: 待排序的数组
+        :param engine: 'python'（逐元素记录）或 'numpy'（向量化，每个阶段一帧）
+        :param kwargs: 其余参数见 SortVisualizer
+        """
+        if engine not in ('python', 'numpy'):
+            raise ValueError(f'未知的计数排序引擎: {engine}')
+        self.engine = engine
+        super().__init__(data, **kwargs)
+
+    def _prepare(self, data):
+        if self.engine == 'numpy':
+            return np.array(data)  # 向量化引擎直接在数组上运行，不转换为列表
+        return super()._prepare(data)
+
+    def _steps(self):
+        if self.engine == 'numpy':
+            return (yield from self._counting_sort_numpy(self.data))
+        arr = list(self.data)
+        yield from self._counting_sort(arr)
+        return arr
 
     def _counting_sort(self, arr):
         """
@@ -53,80 +95,117 @@ class CountingSortVisualizer:
         if not arr:
             return
 
-        # 找出数组中的最大值
-        max_value = max(arr)
+        # 找出数组中的最小值和最大值（转成 Python 整数计算，避免 int8 等窄类型的 NumPy 整数溢出）
+        min_value, max_value = int(min(arr)), int(max(arr))
+        if max_value - min_value + 1 > SPARSE_RATIO * len(arr):
+            # 范围远大于元素个数：计数器下标取键在所有不同键中的名次
+            keys = sorted(set(arr))
+            rank = {key: r for r, key in enumerate(keys)}
+            slots = [rank[num] for num in arr]
+            # 键表和每个元素的名次按 8 字节计
+            table = 8 * len(keys) + 8 * len(arr)
+        else:
+            keys = None
+            slots = [int(num) - min_value for num in arr]
+            table = 0
         # 初始化计数数组
-        count = [0] * (max_value + 1)
+        count = [0] * (len(keys) if keys is not None else max_value - min_value + 1)
         # 初始化输出数组
         output = [0] * len(arr)
+        nbytes = 8 * len(count) + self.frames.itemsize * len(arr) + table  # 计数器按 8 字节计
+        self.frames.alloc(nbytes)
+
+        trace = self.frames.recording  # 只计数（record=False）时不 yield，写入次数整段统计
 
         # 统计每个元素出现的次数
-        for i, num in enumerate(arr):
-            count[num] += 1
-            self.frames.append((arr.copy(), i, 'count'))  # 传索引 i，而不是数值 num
+        for i, slot in enumerate(slots):
+            count[slot] += 1
+            if trace:
+                yield self.frames.mark(i, label='count')  # 传索引 i，而不是数值 num
 
         # 累加计数数组
         for i in range(1, len(count)):
             count[i] += count[i - 1]
-            self.frames.append((arr.copy(), i, 'accumulate'))
+            if trace:
+                yield self.frames.mark(i, label='accumulate')
 
         # 构建输出数组
         for i in range(len(arr) - 1, -1, -1):  # 逆序遍历以保持稳定性
-            num = arr[i]
-            output[count[num] - 1] = num
-            count[num] -= 1
-            self.frames.append((output.copy(), i, 'build'))  # 传索引 i，而不是数值 num
+            num, slot = arr[i], slots[i]
+            output[count[slot] - 1] = num
+            count[slot] -= 1
+            if trace:
+                yield self.frames.write(count[slot], num, i, label='build', buf=AUX)  # 传索引 i，而不是数值 num
 
         # 复制回原数组
-        for i in range(len(arr)):
-            arr[i] = output[i]
-            self.frames.append((arr.copy(), i, 'copy'))
+        if trace:
+            for i in range(len(arr)):
+                arr[i] = output[i]
+                yield self.frames.write(i, output[i], label='copy')
+        else:
+            arr[:] = output
+            self.frames.tally(writes=2 * len(arr))  # 构建和复制各写入 n 次
+        self.frames.free(nbytes)
+
+    def _counting_sort_numpy(self, values):
+        """
+        用 NumPy 向量化地进行计数排序，每个阶段记录一帧。
 
-    def _update(self, frame_data, ax):
+        :param values: 待排序的数组（不会被修改）
+        :return: 排好序的新数组
         """
-        更新动画帧，绘制当前排序状态。
+        if not len(values):
+            return values.copy()
+
+        min_value, max_value = int(values.min()), int(values.max())
+        if max_value - min_value + 1 > SPARSE_RATIO * len(values):
+            # 范围远大于元素个数：计数器下标取键在所有不同键中的名次
+            keys, slots = np.unique(values, return_inverse=True)
+            table = 8 * len(keys) + 8 * len(values)
+        else:
+            # 在 64 位整数上计算偏移量，int8 等窄类型直接相减会溢出
+            wide = np.uint64 if values.dtype == np.uint64 else np.int64
+            slots = values.astype(wide) - wide(min_value)
+            keys = (np.arange(max_value - min_value + 1, dtype=wide) + wide(min_value)).astype(values.dtype)
+            table = 0
+        count = np.bincount(slots, minlength=len(keys))  # 统计每个元素出现的次数
+        nbytes = 8 * len(count) + self.frames.itemsize * len(values) + table
+        self.frames.alloc(nbytes)
+        # 整段操作，不高亮单个柱子
+        yield self.frames.mark(-1, label='count')
+
+        # 累加计数数组：计数器 k 对应的元素占据输出数组的 [前 k 个计数之和, 前 k + 1 个计数之和)，
+        # 相同的键无法区分，按这些区间依次写入就是 np.repeat，不需要真正算出累加计数
+        yield self.frames.mark(-1, label='accumulate')
+
+        output = np.repeat(keys, count)
+        yield self.frames.assign(output, -1, label='build', buf=AUX)
+
+        # 复制回原数组（输出数组直接作为结果）
+        yield self.frames.assign(output, -1, label='copy')
+        self.frames.free(nbytes)
+        return output
+
+    def _style(self, frame_data):
+        """
+        返回当前帧的绘制方案。
 
         :param frame_data: 当前帧的数据
-        :param ax: Matplotlib 的 Axes 对象
+        :return: (数组, 高亮颜色, 顶部标注, 标题)
         """
         frame, idx, action = frame_data
-        ax.clear()
-        bars = ax.bar(range(len(frame)), frame, color=['blue'] * len(frame))
-
-        if 0 <= idx < len(bars):  # 确保 idx 在 bars 可访问范围内
+        colors = {}
+        if 0 <= idx < len(frame):  # 确保 idx 在柱子的索引范围内
             if action == 'count':
-                bars[idx].set_color('red')  # 标记当前操作的元素
+                colors[idx] = 'red'  # 标记当前操作的元素
             elif action == 'accumulate':
-                bars[idx].set_color('orange')  # 标记累加计数的索引
+                colors[idx] = 'orange'  # 标记累加计数的索引
             elif action == 'build':
-                bars[idx].set_color('green')  # 标记构建输出数组的元素
+                colors[idx] = 'green'  # 标记构建输出数组的元素
             elif action == 'copy':
-                bars[idx].set_color('purple')  # 标记复制回原数组的元素
-
-        ax.set_ylim(0, max(self.data) + 1)
-        ax.set_title(f'Step: {len(self.frames)} - {action.upper()}')
-
-    def _init_draw(self, ax):
-        """
-        初始化动画帧。
+                colors[idx] = 'purple'  # 标记复制回原数组的元素
 
-        :param ax: Matplotlib 的 Axes 对象
-        """
-        ax.clear()
-        bars = ax.bar(range(len(self.data)), self.data, color=['blue'] * len(self.data))
-        ax.set_ylim(0, max(self.data) + 1)
-        ax.set_title('Step: 0 - INIT')
-        return bars
-
-    def animate(self):
-        """
-        运行动画，展示排序过程。
-        """
-        fig, ax = plt.subplots()
-        ani = animation.FuncAnimation(fig, self._update, frames=self.frames, 
-                                      init_func=lambda: self._init_draw(ax), 
-                                      fargs=(ax,), interval=500, repeat=False)
-        plt.show()
+        return frame, colors, [], f'Step: {len(self.frames)} - {action.upper()}'
 
 if __name__ == "__main__":
     data = np.random.randint(1, 20, 10)  # 生成 10 个随机整数
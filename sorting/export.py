@@ -0,0 +1,163 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 无界面并行导出排序动画（GIF / MP4）
+
+# 设计思路：
+# 原先只能通过交互式的 plt.show() 播放，导出需要串行地逐帧绘制。
+# export 把整条帧序列切成若干段，交给进程池并行光栅化：
+# - 每个工作进程直接使用 Agg 画布（不经过 pyplot，不需要图形界面），
+#   先定位到本段的起始帧（从随轨迹传来的关键帧出发），再逐帧绘制，输出原始 RGB 像素；
+# - 主进程按顺序取回各段结果并拼接：
+#   系统中有 ffmpeg 时通过管道把原始 RGB 流式写给 ffmpeg 编码（GIF 或 MP4），
+#   否则由工作进程把每帧量化为调色板图像，主进程用 Pillow 写 GIF（MP4 必须依赖 ffmpeg）。
+# 各段互不依赖，耗时随核数近似线性下降。
+
+import math
+import os
+import pickle
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+from .render import make_renderer
+
+# 工作进程中的可视化对象和待绘制的帧序列，由 _init_worker 设置
+_worker_visualizer = None
+_worker_frames = None
+
+
+def _init_worker(payload):
+    global _worker_visualizer, _worker_frames
+    _worker_visualizer, _worker_frames = pickle.loads(payload)
+
+
+def _render_chunk(start, stop, figsize, dpi, quantize, kind):
+    """
+    在工作进程中绘制第 start 到 stop - 1 帧。
+
+    :param quantize: 是否把每帧转换为调色板模式的 Pillow 图像（用于 Pillow 写 GIF）
+    :param kind: 渲染方式（见 render.make_renderer）
+    :return: (宽, 高, 各帧 RGB 像素拼接成的字节串，或调色板图像列表)
+    """
+    visualizer, frames = _worker_visualizer, _worker_frames
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    renderer = make_renderer(ax, visualizer.data, kind)
+    # 与 blit 相同：静态背景只画一次，之后每帧只重绘动画元素
+    visualizer._update(frames[start], renderer)
+    for artist in renderer.artists:
+        artist.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    width, height = canvas.get_width_height()
+
+    pixels = bytearray()
+    images = []
+    for k in range(start, stop):
+        artists = visualizer._update(frames[k], renderer)
+        canvas.restore_region(background)
+        for artist in artists:
+            ax.draw_artist(artist)
+        rgb = np.asarray(canvas.buffer_rgba())[..., :3]
+        if quantize:
+            # 颜色量化也在工作进程中完成，每帧只占 宽 × 高 字节
+            images.append(Image.fromarray(rgb).quantize(method=Image.Quantize.FASTOCTREE))
+        else:
+            pixels += rgb.tobytes()
+    return width, height, images if quantize else bytes(pixels)
+
+
+def _ffmpeg_writer(path, width, height, fps):
+    """
+    启动 ffmpeg 进程，从标准输入读取原始 RGB 帧。
+    """
+    command = ['ffmpeg', '-y', '-loglevel', 'error',
+               '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps),
+               '-i', '-']
+    if not path.lower().endswith('.gif'):
+        # H.264 要求宽高为偶数
+        command += ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p']
+    command.append(path)
+    return subprocess.Popen(command, stdin=subprocess.PIPE)
+
+
+def export(visualizer, path, frames=None, fps=2, workers=None, chunk_size=None, figsize=None, dpi=100,
+           renderer='auto'):
+    """
+    把排序动画导出为 GIF 或 MP4 文件。
+
+    :param visualizer: 已记录排序过程的可视化对象
+    :param path: 输出文件路径，按扩展名决定格式
+    :param frames: 要导出的帧序列，默认为 visualizer.frames 的全部帧
+    :param fps: 每秒帧数
+    :param workers: 并行绘制的进程数，默认为 CPU 核数；为 1 时在当前进程中绘制
+    :param chunk_size: 每个任务绘制的帧数，默认按进程数自动划分
+    :param figsize: 图像尺寸（英寸），默认使用 Matplotlib 的设置
+    :param dpi: 每英寸像素数
+    :param renderer: 渲染方式，'bars'、'columns' 或 'auto'（见 render.make_renderer）
+    """
+    path = os.fspath(path)
+    use_ffmpeg = shutil.which('ffmpeg') is not None
+    if not use_ffmpeg and not path.lower().endswith('.gif'):
+        raise RuntimeError('导出 GIF 以外的格式需要安装 ffmpeg')
+
+    if frames is None:
+        frames = visualizer.frames
+    total = len(frames)
+    if total == 0:
+        raise ValueError('没有可导出的帧')
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # 每个进程分到若干段，兼顾负载均衡和每段定位起始帧的开销
+        chunk_size = min(max(math.ceil(total / (workers * 4)), 16), 256)
+    bounds = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+    starts, stops = zip(*bounds)
+    count = len(bounds)
+    args = (starts, stops, [figsize] * count, [dpi] * count, [not use_ffmpeg] * count, [renderer] * count)
+
+    trace = getattr(frames, 'trace', frames)  # 抽稀后的帧序列（TraceSelection）背后的完整轨迹
+    if workers > 1 and count > 1 and trace._keyframes is None:
+        # 各段在不同的进程中从起始帧开始绘制，没有关键帧时每段都要从头重放，总开销随帧数平方增长；
+        # 关键帧随轨迹一起送往工作进程，定位起始帧最多重放一个关键帧间隔的事件
+        trace.build_keyframes()
+    payload = pickle.dumps((visualizer, frames))
+    if workers == 1:
+        _init_worker(payload)
+        _write(map(_render_chunk, *args), path, fps, use_ffmpeg)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(payload,)) as pool:
+            # map 按提交顺序返回结果，各段按顺序拼接
+            _write(pool.map(_render_chunk, *args), path, fps, use_ffmpeg)
+
+
+def _write(chunks, path, fps, use_ffmpeg):
+    """
+    按顺序把各段像素写入输出文件。
+    """
+    if use_ffmpeg:
+        process = None
+        try:
+            for width, height, pixels in chunks:
+                if process is None:
+                    process = _ffmpeg_writer(path, width, height, fps)
+                process.stdin.write(pixels)
+        finally:
+            if process is not None:
+                process.stdin.close()
+                if process.wait() != 0:
+                    raise RuntimeError(f'ffmpeg 编码失败，退出码 {process.returncode}')
+        return
+
+    images = []
+    for _, _, chunk in chunks:
+        images.extend(chunk)
+    images[0].save(path, save_all=True, append_images=images[1:],
+                   duration=round(1000 / fps), loop=0)
@@ -0,0 +1,220 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 基于内存映射文件的外部归并排序
+
+# 算法思想：
+# 数据比内存大时无法整体读入，外部归并排序分两步：
+# 1. 生成有序段：每次读入 chunk_size 个元素，在内存中排好序后写回磁盘，得到若干个有序段（run）；
+# 2. 多路归并：每一轮把相邻的 fan_in 个有序段合并成一段，直到只剩一段。
+# 与 MergeSortVisualizer 的自底向上归并相同，各轮在两个文件（输出文件和一个临时文件）之间来回写，
+# 只需一个与数据等长的临时文件；按总轮数的奇偶选择第一轮写哪个文件，最后一轮恰好写入输出文件。
+
+# 时间复杂度分析：
+# - 生成有序段 O(n log chunk_size)，每轮归并 O(n log fan_in)，共 ⌈log_fan_in(段数)⌉ 轮。
+# - 每一轮顺序读、顺序写整个文件各一次，磁盘读写量为 O(n × 轮数)。
+
+# 空间复杂度分析：
+# - 内存中只有一个有序段（生成阶段）或 fan_in 个输入块加输出缓冲（归并阶段），与 n 无关。
+
+# 块式多路归并：
+# 逐个元素用堆做 k 路归并，每个元素都要经过一次 Python 层面的堆操作，速度受限于解释器而不是磁盘。
+# 这里每一路只在内存中缓存一块（block_size 个元素），堆中按各块的末尾元素排序：
+# - 堆顶块的末尾元素 cutoff 是所有缓存块末尾元素中最小的，各块中不大于 cutoff 的元素
+#   （用 np.searchsorted 找出）一定排在其他尚未读入的元素之前，可以整批取出；
+# - 取出的各段用 np.sort(kind='stable') 合并（各段本身有序，NumPy 的稳定排序会利用已有的有序段），
+#   按段的顺序拼接再稳定排序，相等的元素保持原有顺序，整个排序是稳定的；
+# - 末尾元素不大于 cutoff 的块已经全部取出，从堆中弹出并读入该路的下一块。
+# 每一轮至少取出一整块，堆操作的次数是 O(n / block_size)，逐元素的工作全部在 NumPy 中完成，
+# 吞吐量取决于磁盘带宽。
+#
+# 动画：
+# 文件可能比内存大，不能逐个元素记录。这里在文件中等间隔选取 samples 个位置，
+# 动画显示这些位置上的当前值：每生成一个有序段（'run'）、归并时每写出一批（'merge'）记录一帧，
+# 高亮本段对应的范围；每一轮结束时记录一帧 'pass'（阶段边界）。
+# 写入次数按实际写入文件的元素数统计，辅助空间按内存中的缓冲区统计。
+
+import heapq
+import os
+import tempfile
+import weakref
+
+import numpy as np
+
+from .visualizer import SAMPLES, SampledSortVisualizer
+
+CHUNK_SIZE = 2 ** 22  # 生成有序段时每次读入的元素数
+FAN_IN = 16           # 每轮合并的路数
+BLOCK_SIZE = 2 ** 16  # 归并时每一路缓存的元素数
+
+
+class ExternalMergeSortVisualizer(SampledSortVisualizer):
+    """
+    外部归并排序可视化类：对内存映射文件（或数组）分块排序并多路归并，动画显示等间隔采样的元素。
+    """
+    init_title = 'Step: 0 - INIT'
+    phase_labels = ('pass',)
+    cacheable = False  # 结果写入文件（有副作用），源数据可能比内存大，不缓存
+
+    def __init__(self, source, out=None, chunk_size=CHUNK_SIZE, fan_in=FAN_IN, block_size=BLOCK_SIZE,
+                 samples=SAMPLES, tmp_dir=None, **kwargs):
+        """
+        :param source: 待排序的数据：.npy 文件路径（以只读内存映射方式打开）、np.memmap 或数组
+        :param out: 输出的 .npy 文件路径，默认在 tmp_dir 中创建，随结果对象一起删除
+        :param chunk_size: 生成有序段时每次读入内存的元素数
+        :param fan_in: 每轮合并的路数，至少为 2
+        :param block_size: 归并时每一路缓存的元素数
+        :param samples: 动画中显示的采样位置数
+        :param tmp_dir: 临时文件所在的目录，默认为系统临时目录
+        :param kwargs: 其余参数见 SampledSortVisualizer
+        """
+        if chunk_size < 1 or block_size < 1:
+            raise ValueError('chunk_size 和 block_size 至少为 1')
+        if fan_in < 2:
+            raise ValueError('fan_in 至少为 2')
+        if isinstance(source, (str, os.PathLike)):
+            source = np.load(source, mmap_mode='r')
+        self.out = out
+        self.chunk_size = chunk_size
+        self.fan_in = fan_in
+        self.block_size = block_size
+        self.tmp_dir = tmp_dir
+        super().__init__(source, samples, **kwargs)
+
+    def _open_output(self, n, dtype):
+        """
+        创建输出的 .npy 文件（内存映射）；未指定路径时在临时目录中创建，结果对象被回收时删除。
+        """
+        path = self.out
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='sorted-', suffix='.npy', dir=self.tmp_dir)
+            os.close(fd)
+        out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(n,))
+        if self.out is None:
+            weakref.finalize(out, os.remove, path)
+        return out
+
+    def _steps(self):
+        source = self.source
+        n = len(source)
+        out = self._open_output(n, source.dtype)
+        if n == 0:
+            return out
+        view = np.array(self.data)  # 采样位置上的当前值
+        runs = list(range(0, n, self.chunk_size)) + [n]  # 各有序段的边界
+        passes, count = 0, len(runs) - 1
+        while count > 1:
+            count = -(-count // self.fan_in)
+            passes += 1
+
+        tmp = None
+        try:
+            files = [out]
+            if passes:
+                fd, tmp = tempfile.mkstemp(prefix='runs-', suffix='.npy', dir=self.tmp_dir)
+                os.close(fd)
+                buffer = np.lib.format.open_memmap(tmp, mode='w+', dtype=source.dtype, shape=(n,))
+                # 最后一轮写入输出文件
+                files = [out, buffer] if passes % 2 == 0 else [buffer, out]
+
+            # 生成有序段
+            dst = files[0]
+            nbytes = self.frames.itemsize * min(self.chunk_size, n)
+            self.frames.alloc(nbytes)
+            for start, stop in zip(runs, runs[1:]):
+                dst[start:stop] = np.sort(np.asarray(source[start:stop]), kind='stable')
+                yield from self._show(view, dst, start, stop, label='run')
+            self.frames.free(nbytes)
+            dst.flush()
+            yield self.frames.mark(0, len(view) - 1, label='pass')
+
+            # 多路归并，每一轮在两个文件之间来回写
+            for p in range(1, passes + 1):
+                src, dst = files[(p - 1) % 2], files[p % 2]
+                merged = runs[::self.fan_in]
+                if merged[-1] != n:
+                    merged.append(n)
+                for g in range(0, len(runs) - 1, self.fan_in):
+                    yield from self._merge(src, dst, runs[g:g + self.fan_in + 1], view)
+                runs = merged
+                dst.flush()
+                yield self.frames.mark(0, len(view) - 1, label='pass')
+        finally:
+            if tmp is not None:
+                os.remove(tmp)
+        return out
+
+    def _merge(self, src, dst, bounds, view):
+        """
+        把 src 中以 bounds 为边界的若干个相邻有序段合并，写入 dst 的相同位置。
+
+        :param bounds: 各段的边界 [b0, b1, ..., bk]，第 i 段为 [bounds[i], bounds[i + 1])
+        """
+        starts, ends = bounds[:-1], bounds[1:]
+        k, block = len(starts), self.block_size
+        nbytes = 2 * k * block * self.frames.itemsize  # 各路的输入块，加上最多同样多的待写出数据
+        self.frames.alloc(nbytes)
+        pos = list(starts)       # 各路下一块的起始位置
+        buffers = [None] * k     # 各路缓存的块中尚未取出的部分
+        heap = []                # (块的末尾元素, 路号)，只包含缓存不为空的路
+
+        def refill(i):
+            buffers[i] = np.array(src[pos[i]:min(pos[i] + block, ends[i])])
+            pos[i] += len(buffers[i])
+            if len(buffers[i]):
+                heapq.heappush(heap, (buffers[i][-1], i))
+
+        for i in range(k):
+            refill(i)
+        written = starts[0]
+        pending, size = [], 0  # 已取出、尚未写出的各段
+        while heap:
+            cutoff = heap[0][0]
+            # 各路中不大于 cutoff 的元素都可以取出
+            for i in range(k):
+                buf = buffers[i]
+                if buf is not None and len(buf):
+                    c = int(np.searchsorted(buf, cutoff, side='right'))
+                    if c:
+                        pending.append(buf[:c])
+                        buffers[i] = buf[c:]
+                        size += c
+            # 末尾元素不大于 cutoff 的块已经取空，读入下一块；
+            # 先全部弹出再读入，新读入的块末尾也可能等于 cutoff，留到下一批取出
+            exhausted = []
+            while heap and heap[0][0] <= cutoff:
+                exhausted.append(heapq.heappop(heap)[1])
+            for i in exhausted:
+                refill(i)
+            if size >= block or not heap:
+                dst[written:written + size] = np.sort(np.concatenate(pending), kind='stable')
+                yield from self._show(view, dst, written, written + size, label='merge', origin=starts[0])
+                written += size
+                pending, size = [], 0
+        self.frames.free(nbytes)
+
+    def _style(self, frame_data):
+        """
+        返回当前帧的绘制方案。
+
+        :param frame_data: 当前帧的数据
+        :return: (数组, 高亮颜色, 顶部标注, 标题)
+        """
+        frame, first, last, action = frame_data
+        colors = {}
+        if action == 'run':
+            colors[range(first, last + 1)] = 'orange'  # 刚生成的有序段
+        elif action == 'merge':
+            colors[range(first, last + 1)] = 'green'   # 本组已合并的部分
+        return frame, colors, [], f'Step: {len(self.frames)} - {action.upper()}'
+
+
+if __name__ == "__main__":
+    from .workloads import generate
+
+    # 生成一个 10⁶ 个元素的文件，分成 16 个有序段、每轮 4 路合并，共两轮
+    path = os.path.join(tempfile.gettempdir(), 'external-sort-demo.npy')
+    np.save(path, generate('random', 10 ** 6, seed=0))
+    sorter = ExternalMergeSortVisualizer(path, chunk_size=2 ** 16, fan_in=4, block_size=2 ** 12)
+    sorter.animate(interval=100)
@@ -26,26 +26,47 @@
 #
 # 空间复杂度计算：
 # 插入排序是原地排序，仅使用少量额外变量，空间复杂度为 O(1)。
+#
+# 二分插入（binary=True）：
+# 已排序部分是有序的，可以从当前位置向左以 1、2、4、... 的步长指数搜索，再在最后一步的范围内二分，
+# 找到插入位置（与 bisect.bisect_right 相同，保持稳定）。比较次数降为 O(n log n)，
+# 并且只与元素要移动的距离的对数成正比；再用一次切片赋值把插入位置之后的一段整体后移一位。
+# 当前元素不小于前一个元素时已经在正确位置上，只比较一次，因此基本有序的数据接近 O(n)。
+# 每插入一个元素只记录一条 SHIFT 事件（一帧），而不是每移动一个元素一帧；已在正确位置的元素不记录。
+# 移动元素的次数与逐个后移相同，仍为 O(n^2)，但由切片赋值在 C 层完成。
 
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import numpy as np
 
-class InsertionSortVisualizer:
+from .visualizer import SortVisualizer
+
+class InsertionSortVisualizer(SortVisualizer):
     """
     插入排序可视化类，提供排序及动画演示功能。
     """
-    def __init__(self, data):
-        self.data = list(data)  # 复制数据，避免修改原始数据
-        self.frames = []  # 存储每一帧的数据和高亮索引
-        self._insertion_sort()
+    binary = False
+
+    def __init__(self, data, binary=False, **kwargs):
+        """
+        :param data: 待排序的数组
+        :param binary: 是否使用二分插入（每插入一个元素记录一帧）
+        :param kwargs: 其余参数见 SortVisualizer
+        """
+        self.binary = binary
+        super().__init__(data, **kwargs)
+
+    def _steps(self):
+        if self.binary:
+            return self._binary_insertion_sort()
+        return self._insertion_sort()
     
     def _insertion_sort(self):
         """
-        执行插入排序，并记录排序过程。
+        执行插入排序，并记录排序过程，返回排好序的数组。
         """
         arr = self.data.copy()
         n = len(arr)
+        trace = self.frames.recording  # 只计数（record=False）时不 yield，写入次数在本地累加
+        comparisons = writes = 0
         
         for i in range(1, n):
             key = arr[i]
@@ -53,37 +74,74 @@ class InsertionSortVisualizer:
             
             while j >= 0 and arr[j] > key:
                 arr[j + 1] = arr[j]  # 向右移动元素
-                self.frames.append((arr.copy(), j, j + 1))  # 记录当前状态
+                if trace:
+                    yield self.frames.write(j + 1, arr[j], j, j + 1)  # 记录移动
                 j -= 1
             
+            # 每次移动前都比较成功了一次，循环因 arr[j] <= key 结束时还多比较了一次
+            comparisons += i - 1 - j + (j >= 0)
             arr[j + 1] = key  # 插入当前元素
-            self.frames.append((arr.copy(), j + 1, i))  # 记录插入后的状态
+            if trace:
+                yield self.frames.write(j + 1, key, j + 1, i)  # 记录插入
+            else:
+                writes += i - j  # 移动 i - 1 - j 次，再写入 key 一次
+        self.frames.tally(comparisons=comparisons, writes=writes)
+        return arr
+
+    def _binary_insertion_sort(self):
+        """
+        执行二分插入排序，并记录排序过程，返回排好序的数组。
+        """
+        arr = self.data.copy()
+        n = len(arr)
+        trace = self.frames.recording
+        comparisons = writes = 0
+
+        for i in range(1, n):
+            key = arr[i]
+            comparisons += 1
+            if not key < arr[i - 1]:
+                continue  # 已经在正确位置上
+
+            # 查找第一个大于 key 的位置：先从 i - 1 向左指数搜索，
+            # 保持 arr[high] > key，且 low 之前的元素都不大于 key
+            low, high, step = 0, i - 1, 1
+            while high - step >= 0:
+                comparisons += 1
+                if key < arr[high - step]:
+                    high -= step
+                    step *= 2
+                else:
+                    low = high - step + 1
+                    break
+            # 再在 [low, high] 中二分
+            while low < high:
+                mid = (low + high) // 2
+                comparisons += 1
+                if key < arr[mid]:
+                    high = mid
+                else:
+                    low = mid + 1
+
+            arr[low + 1:i + 1] = arr[low:i]  # 整段后移一位
+            arr[low] = key  # 插入当前元素
+            if trace:
+                yield self.frames.shift(low, i, key)  # 记录整段后移和插入
+            else:
+                writes += i - low + 1
+        self.frames.tally(comparisons=comparisons, writes=writes)
+        return arr
     
-    def _update(self, frame_data, ax):
+    def _style(self, frame_data):
         """
-        更新动画帧，绘制当前排序状态。
+        返回当前帧的绘制方案：(数组, 高亮颜色, 顶部标注, 标题)。
         """
         frame, idx1, idx2 = frame_data
-        ax.clear()
-        bars = ax.bar(range(len(frame)), frame, color=['blue'] * len(frame))
-        
         # 变色高亮当前比较的元素
-        bars[idx1].set_color('red')
-        bars[idx2].set_color('yellow')
-        
+        colors = {idx1: 'red', idx2: 'yellow'}
         # 在柱子顶部加箭头标注
-        ax.annotate('⬆', (idx1, frame[idx1]), ha='center', va='bottom', fontsize=12, color='red')
-        ax.annotate('⬆', (idx2, frame[idx2]), ha='center', va='bottom', fontsize=12, color='red')
-        
-        ax.set_ylim(0, max(self.data) + 1)
-    
-    def animate(self):
-        """
-        运行动画，展示排序过程。
-        """
-        fig, ax = plt.subplots()
-        ani = animation.FuncAnimation(fig, self._update, frames=self.frames, fargs=(ax,), interval=500, repeat=False)
-        plt.show()
+        markers = [(idx1, '⬆', 'red'), (idx2, '⬆', 'red')]
+        return frame, colors, markers, None
 
 # 示例用法：
 if __name__ == "__main__":
@@ -14,6 +14,7 @@
 # 2. 递归地对左半部分进行归并排序。
 # 3. 递归地对右半部分进行归并排序。
 # 4. 将排好序的左右两部分归并为一个有序数组。
+# （这里实现的是等价的自底向上版本：从已有的有序段出发，逐轮两两合并。）
 
 # 时间复杂度分析：
 # - 每次划分数组的时间复杂度为 O(log n)，
@@ -23,88 +24,254 @@
 # 空间复杂度分析：
 # - 合并过程中需要额外空间存放临时数组，空间复杂度为 O(n)。
 
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+# 自底向上的自然归并：
+# 递归版本每次合并都要复制出左右两个临时数组。这里改为自底向上、不递归：
+# - 先扫描出数组中已有的有序段（run），严格递减的段原地翻转，因此有序或基本有序的输入只有很少几段；
+# - 每一轮把相邻的两段合并成一段，在原数组和一个预先分配好的辅助数组之间来回写（ping-pong），
+#   每一轮只读一个缓冲区、写另一个，不再为每次合并分配临时数组；
+# - 两段首尾已经有序时不必逐个比较；某一侧连续胜出 MIN_GALLOP 次后进入“飞奔”模式（与 Timsort 相同），
+#   用指数搜索加二分一次找出这一侧可以整块写入的元素，段与段交错较少时比较次数远少于逐个比较。
+# 有序的输入只需 n - 1 次比较，基本有序的输入接近 O(n)。
+# 动画中的数组按“原地合并”的方式展示：合并结果写到对应的位置上，
+# 帧仍然是 'split'（将要合并的两段）、'merge'（写入一个元素）和 'merged'（合并完成），
+# 另外翻转递减段时记录 'reverse' 交换帧。
+# 不记录（record=False）时不产生帧：翻转、飞奔和剩余部分的复制都用切片整段完成，写入次数整段统计。
+
 import numpy as np
 
-class MergeSortVisualizer:
+from .visualizer import SortVisualizer
+
+MIN_GALLOP = 7  # 一侧连续胜出这么多次后进入飞奔模式
+
+class MergeSortVisualizer(SortVisualizer):
     """
     归并排序可视化类，提供分治策略排序及动画演示功能。
     """
-    def __init__(self, data):
-        self.data = list(data)
-        self.frames = []
-        self._merge_sort(self.data, 0, len(self.data) - 1)
-
-    def _merge_sort(self, arr, left, right):
-        if left < right:
-            mid = (left + right) // 2
-            # 添加拆分前的状态
-            self.frames.append((arr.copy(), left, mid, right, 'split'))
-            self._merge_sort(arr, left, mid)
-            self._merge_sort(arr, mid + 1, right)
-            self._merge(arr, left, mid, right)
-
-    def _merge(self, arr, left, mid, right):
-        L = arr[left:mid + 1]
-        R = arr[mid + 1:right + 1]
-        i = j = 0
-        k = left
-        
-        while i < len(L) and j < len(R):
-            if L[i] <= R[j]:
-                arr[k] = L[i]
-                self.frames.append((arr.copy(), k, left + i, 'merge'))
-                i += 1
-            else:
-                arr[k] = R[j]
-                self.frames.append((arr.copy(), k, mid + 1 + j, 'merge'))
+    phase_labels = ('split', 'merged')
+
+    def _steps(self):
+        arr = list(self.data)
+        yield from self._merge_sort(arr)
+        return arr
+
+    def _merge_sort(self, arr):
+        """
+        自底向上地对数组进行自然归并排序，并记录排序过程中的状态。
+
+        :param arr: 待排序的数组
+        """
+        n = len(arr)
+        if n < 2:
+            return
+        bounds = yield from self._find_runs(arr)
+        if len(bounds) == 2:
+            return  # 整个数组已经是一个有序段
+        # 预先分配的辅助数组，与原数组轮流作为读写的一方
+        aux = [0] * n
+        nbytes = n * self.frames.itemsize
+        self.frames.alloc(nbytes)
+        src, dst = arr, aux
+        while len(bounds) > 2:
+            merged = [0]
+            for r in range(0, len(bounds) - 1, 2):
+                left = bounds[r]
+                if r + 2 < len(bounds):
+                    right = bounds[r + 2]
+                    yield from self._merge(src, dst, left, bounds[r + 1], right)
+                else:
+                    # 落单的最后一段原样复制到另一个缓冲区，动画中的数组不变
+                    right = n
+                    dst[left:right] = src[left:right]
+                    self.frames.tally(writes=right - left)
+                merged.append(right)
+            bounds = merged
+            src, dst = dst, src
+        if src is not arr:
+            arr[:] = src
+            self.frames.tally(writes=n)
+        self.frames.free(nbytes)
+
+    def _find_runs(self, arr):
+        """
+        找出数组中已有的有序段，严格递减的段原地翻转为递增。
+
+        :return: 各段的边界 [0, ..., n]，第 r 段为 [bounds[r], bounds[r + 1])
+        """
+        n = len(arr)
+        bounds = [0]
+        comparisons = 0
+        i = 0
+        while i < n:
+            j = i + 1
+            if j < n:
+                comparisons += 1
+                if arr[j] < arr[i]:
+                    # 严格递减（翻转后仍保持稳定）
+                    j += 1
+                    while j < n:
+                        comparisons += 1
+                        if not arr[j] < arr[j - 1]:
+                            break
+                        j += 1
+                    yield from self._reverse(arr, i, j - 1)
+                else:
+                    j += 1
+                    while j < n:
+                        comparisons += 1
+                        if arr[j] < arr[j - 1]:
+                            break
+                        j += 1
+            bounds.append(j)
+            i = j
+        self.frames.tally(comparisons=comparisons)
+        return bounds
+
+    def _reverse(self, arr, low, high):
+        """
+        原地翻转 arr[low..high]。
+        """
+        if not self.frames.recording:
+            # 只计数时整段翻转
+            arr[low:high + 1] = arr[low:high + 1][::-1]
+            self.frames.tally(swaps=(high - low + 1) // 2)
+            return
+        while low < high:
+            arr[low], arr[high] = arr[high], arr[low]
+            yield self.frames.swap(low, high, label='reverse')
+            low += 1
+            high -= 1
+
+    def _merge(self, src, dst, left, mid, right):
+        """
+        把 src 中相邻的有序段 [left, mid) 和 [mid, right) 合并写入 dst 的 [left, right)。
+        """
+        trace = self.frames.recording  # 只计数（record=False）时不 yield，写入次数整段统计
+        # 添加合并前的状态（与递归版本相同，右端点为闭区间）
+        if trace:
+            yield self.frames.mark(left, mid - 1, right - 1, label='split')
+        comparisons = 1
+        if src[mid - 1] <= src[mid]:
+            # 两段首尾已经有序，整块复制，动画中的数组不变
+            dst[left:right] = src[left:right]
+            self.frames.tally(comparisons=comparisons, writes=right - left)
+            if trace:
+                yield self.frames.mark(left, mid - 1, right - 1, label='merged')
+            return
+
+        i, j, k = left, mid, left
+        left_wins = right_wins = 0  # 两侧各自连续胜出的次数
+        while i < mid and j < right:
+            comparisons += 1
+            if src[j] < src[i]:
+                dst[k] = src[j]
+                if trace:
+                    yield self.frames.write(k, src[j], k, j, label='merge')
                 j += 1
-            k += 1
+                k += 1
+                right_wins += 1
+                left_wins = 0
+                if right_wins >= MIN_GALLOP and j < right:
+                    # 飞奔：右侧中所有小于 src[i] 的元素可以整块写入
+                    end, count = self._gallop(src, src[i], j, right, inclusive=False)
+                    comparisons += count
+                    if trace:
+                        for j in range(j, end):
+                            dst[k] = src[j]
+                            yield self.frames.write(k, src[j], k, j, label='merge')
+                            k += 1
+                    else:
+                        dst[k:k + end - j] = src[j:end]
+                        k += end - j
+                    j = end
+                    right_wins = 0
+            else:
+                dst[k] = src[i]
+                if trace:
+                    yield self.frames.write(k, src[i], k, i, label='merge')
+                i += 1
+                k += 1
+                left_wins += 1
+                right_wins = 0
+                if left_wins >= MIN_GALLOP and i < mid:
+                    # 飞奔：左侧中所有不大于 src[j] 的元素可以整块写入（相等时左侧在前，保持稳定）
+                    end, count = self._gallop(src, src[j], i, mid, inclusive=True)
+                    comparisons += count
+                    if trace:
+                        for i in range(i, end):
+                            dst[k] = src[i]
+                            yield self.frames.write(k, src[i], k, i, label='merge')
+                            k += 1
+                    else:
+                        dst[k:k + end - i] = src[i:end]
+                        k += end - i
+                    i = end
+                    left_wins = 0
+        if not trace:
+            # 只计数时剩余的一侧整段复制（另一侧已经取完）
+            dst[k:right] = src[i:mid] + src[j:right]
+            self.frames.tally(comparisons=comparisons, writes=right - left)
+            return
+        self.frames.tally(comparisons=comparisons)
 
-        while i < len(L):
-            arr[k] = L[i]
-            self.frames.append((arr.copy(), k, left + i, 'merge'))
+        while i < mid:
+            dst[k] = src[i]
+            yield self.frames.write(k, src[i], k, i, label='merge')
             i += 1
             k += 1
 
-        while j < len(R):
-            arr[k] = R[j]
-            self.frames.append((arr.copy(), k, mid + 1 + j, 'merge'))
+        while j < right:
+            dst[k] = src[j]
+            yield self.frames.write(k, src[j], k, j, label='merge')
             j += 1
             k += 1
 
         # 添加合并后的状态
-        self.frames.append((arr.copy(), left, mid, right, 'merged'))
+        yield self.frames.mark(left, mid - 1, right - 1, label='merged')
+
+    @staticmethod
+    def _gallop(src, key, start, end, inclusive):
+        """
+        在有序段 src[start:end] 中找出第一个大于 key（inclusive 为 False 时为不小于 key）的位置。
+        先以 1、2、4、... 的步长指数搜索，再在最后一步的范围内二分。
+
+        :return: (位置, 比较次数)
+        """
+        def before(value):
+            return value <= key if inclusive else value < key
+
+        comparisons = 0
+        lo, hi, step = start, start, 1
+        while hi < end:
+            comparisons += 1
+            if not before(src[hi]):
+                break
+            lo = hi + 1
+            step *= 2
+            hi = start + step - 1
+        hi = min(hi, end)
+        # [start, lo) 都在 key 之前，hi 为 end 或已知不在 key 之前的位置
+        while lo < hi:
+            m = (lo + hi) // 2
+            comparisons += 1
+            if before(src[m]):
+                lo = m + 1
+            else:
+                hi = m
+        return lo, comparisons
 
-    def _update(self, frame_data, ax):
+    def _style(self, frame_data):
         if len(frame_data) == 5:
             # 拆分或合并后的状态
             frame, left, mid, right, action = frame_data
-            ax.clear()
-            bars = ax.bar(range(len(frame)), frame, color=['blue'] * len(frame))
-            for i in range(left, mid + 1):
-                bars[i].set_color('green')  # 左子数组
-            for i in range(mid + 1, right + 1):
-                bars[i].set_color('orange')  # 右子数组
-            ax.set_ylim(0, max(self.data) + 1)
-            ax.set_title(f'Step: {len(self.frames)} - {action.upper()}')
+            colors = {range(left, mid + 1): 'green',  # 左子数组
+                      range(mid + 1, right + 1): 'orange'}  # 右子数组
+            markers = []
         else:
             # 合并过程中的状态
             frame, idx1, idx2, action = frame_data
-            ax.clear()
-            bars = ax.bar(range(len(frame)), frame, color=['blue'] * len(frame))
-            bars[idx1].set_color('red')
-            bars[idx2].set_color('yellow')
-            ax.annotate('⬆', (idx1, frame[idx1]), ha='center', va='bottom', fontsize=12, color='red')
-            ax.annotate('⬆', (idx2, frame[idx2]), ha='center', va='bottom', fontsize=12, color='red')
-            ax.set_ylim(0, max(self.data) + 1)
-            ax.set_title(f'Step: {len(self.frames)} - {action.upper()}')
-
-    def animate(self):
-        fig, ax = plt.subplots()
-        ani = animation.FuncAnimation(fig, self._update, frames=self.frames, fargs=(ax,), interval=500, repeat=False)
-        plt.show()
+            colors = {idx1: 'red', idx2: 'yellow'}
+            markers = [(idx1, '⬆', 'red'), (idx2, '⬆', 'red')]
+        return frame, colors, markers, f'Step: {len(self.frames)} - {action.upper()}'
 
 if __name__ == "__main__":
     data = np.random.randint(1, 20, 10)
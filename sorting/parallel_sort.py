@@ -0,0 +1,284 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 基于共享内存的多进程并行排序（并行归并排序、样本排序）
+
+# 算法思想：
+# 把数组分成 p 段（p 为工作进程数），分两个阶段并行处理，每个阶段的 p 个任务互不重叠：
+# - 并行归并排序（method='merge'）：
+#   1. 各进程用排序内核对自己的一段排序，得到 p 个有序段；
+#   2. 从各有序段中等间隔取样，选出 p - 1 个分割值，用二分查找把每个有序段切成 p 份，
+#      第 j 个进程把各段的第 j 份合并，写入输出数组中属于它的连续区间。
+# - 样本排序（method='sample'）：
+#   1. 先随机抽取 oversample × p 个样本，排序后选出 p - 1 个分割值，把取值范围分成 p 个桶；
+#      各进程把自己的一段按桶号稳定地重排（段内同一个桶的元素相邻），并统计各桶的元素个数；
+#   2. 第 j 个进程收集各段中属于第 j 个桶的部分，用排序内核排序后写入输出数组中第 j 个桶的区间。
+# 两种方法的第二阶段相同：每个进程从 p 段中各读一份连续的数据，写出一段连续的结果，
+# 写入位置由各份的长度累加得到，进程之间不需要同步。
+
+# 时间复杂度分析：
+# - 分割值取得均匀时每个进程处理约 n / p 个元素，总时间约为 O((n / p) log n)，加上 O(p²) 的切分开销。
+# - 重复值很多时相等的元素都落在同一份（同一个桶）中，负载可能不均衡，但结果仍然正确。
+
+# 空间复杂度分析：
+# - 输入的副本和输出数组各一个，放在共享内存中，共 2n 个元素；排序内核都在共享内存中原地排序。
+
+# 共享内存与进程池：
+# 输入和输出数组放在 multiprocessing.shared_memory 中，任务交给 ProcessPoolExecutor，
+# 每个任务只传递共享内存的名字和下标范围，工作进程直接在共享内存的 NumPy 视图上读写，数组本身不经过 pickle。
+# 排序内核：'quick' 为 NumPy 的内省排序（与 QuickSortVisualizer 相同的快速排序 + 堆排序保护），
+# 'radix' 为 radix_sort.radix_passes 的向量化基数排序（只适用于整数）；
+# 并行归并排序的第二阶段合并各有序段，用 NumPy 的稳定排序（Timsort 会直接利用已有的有序段）。
+#
+# 动画：
+# 与外部排序相同，数据量很大时只显示等间隔采样的位置。主进程每收到一个任务完成的结果就记录一帧，
+# 所有进程的进度按完成的先后合并到同一条轨迹中，本任务写入的区间用完成它的进程的颜色高亮，
+# 各进程负责的区间在数组中并排显示；每个阶段结束时记录一帧 'pass'（阶段边界）。
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .radix_sort import radix_sort_array
+from .visualizer import SAMPLES, SampledSortVisualizer
+
+OVERSAMPLE = 32  # 每个分割值对应的样本数
+
+WORKER_COLORS = ['orange', 'green', 'purple', 'red', 'brown', 'magenta', 'olive', 'cyan']
+
+
+def _radix_kernel(values):
+    values[:] = radix_sort_array(values)
+
+
+# 排序内核，都对传入的数组原地排序
+KERNELS = {
+    'quick': lambda values: values.sort(kind='quicksort'),
+    'radix': _radix_kernel,
+    'stable': lambda values: values.sort(kind='stable'),
+}
+
+_views = {}  # 工作进程中已打开的共享内存：名字 -> (SharedMemory, 视图)
+
+
+def _view(spec):
+    """
+    在工作进程中打开共享内存，返回其上的 NumPy 视图；同一块共享内存只打开一次，进程退出时释放。
+
+    :param spec: (共享内存的名字, 元素个数, dtype)
+    """
+    name, n, dtype = spec
+    if name not in _views:
+        shm = shared_memory.SharedMemory(name=name)
+        _views[name] = shm, np.ndarray((n,), dtype=dtype, buffer=shm.buf)
+    return _views[name][1]
+
+
+def _sort_range(spec, start, stop, kernel):
+    """
+    任务：用排序内核对 arr[start:stop] 原地排序。
+    """
+    KERNELS[kernel](_view(spec)[start:stop])
+    return os.getpid()
+
+
+def _partition_range(spec, start, stop, splitters):
+    """
+    任务：把 arr[start:stop] 按桶号稳定地原地重排，返回 (进程号, 各桶的元素个数)。
+    第 j 个桶为 (splitters[j - 1], splitters[j]]。
+    """
+    arr = _view(spec)
+    chunk = arr[start:stop]
+    buckets = np.searchsorted(splitters, chunk, side='left').astype(np.min_scalar_type(len(splitters)))
+    if len(splitters):
+        arr[start:stop] = chunk[np.argsort(buckets, kind='stable')]
+    return os.getpid(), np.bincount(buckets, minlength=len(splitters) + 1)
+
+
+def _gather_range(src_spec, dst_spec, segments, offset, kernel):
+    """
+    任务：把 src 中的若干段 [a, b) 依次拼接到 dst[offset:] 中，再用排序内核原地排序。
+    """
+    src, dst = _view(src_spec), _view(dst_spec)
+    values = dst[offset:offset + sum(b - a for a, b in segments)]
+    np.concatenate([src[a:b] for a, b in segments], out=values)
+    KERNELS[kernel](values)
+    return os.getpid()
+
+
+class ParallelSortVisualizer(SampledSortVisualizer):
+    """
+    并行排序可视化类：多个进程在共享内存上分段排序，动画中用不同颜色并排显示各进程的进度。
+    """
+    init_title = 'Step: 0 - INIT'
+    phase_labels = ('pass',)
+    cacheable = False  # 轨迹取决于各进程完成任务的先后，不缓存
+    tasks = ()  # 按完成顺序记录的任务 (动作, 首个采样下标, 末个采样下标, 进程编号)
+
+    def __init__(self, data, method='sample', kernel='quick', workers=None, samples=SAMPLES,
+                 oversample=OVERSAMPLE, seed=0, **kwargs):
+        """
+        :param data: 待排序的数组
+        :param method: 'merge'（并行归并排序）或 'sample'（样本排序）
+        :param kernel: 各进程使用的排序内核，'quick' 或 'radix'（只适用于整数）
+        :param workers: 工作进程数，默认为 CPU 核数
+        :param samples: 动画中显示的采样位置数
+        :param oversample: 选取每个分割值所用的样本数
+        :param seed: 样本排序抽样用的随机数种子
+        :param kwargs: 其余参数见 SampledSortVisualizer
+        """
+        if method not in ('merge', 'sample'):
+            raise ValueError(f'未知的并行排序方法: {method}')
+        if kernel not in ('quick', 'radix'):
+            raise ValueError(f'未知的排序内核: {kernel}')
+        source = np.asarray(data)
+        if source.dtype.hasobject:
+            raise ValueError('共享内存中只能存放数值类型的数组')
+        if kernel == 'radix' and not np.issubdtype(source.dtype, np.integer):
+            raise ValueError('基数排序内核只适用于整数')
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        if workers < 1:
+            raise ValueError('工作进程数至少为 1')
+        self.method = method
+        self.kernel = kernel
+        self.workers = workers
+        self.oversample = max(oversample, 1)
+        self.seed = seed
+        self.tasks = []
+        super().__init__(source, samples, **kwargs)
+
+    def _steps(self):
+        source = self.source
+        n = len(source)
+        if n == 0:
+            return source.copy()
+        segments = [shared_memory.SharedMemory(create=True, size=source.nbytes) for _ in range(2)]
+        views = [np.ndarray((n,), dtype=source.dtype, buffer=m.buf) for m in segments]
+        try:
+            data, out = views
+            data[:] = source
+            nbytes = self.frames.itemsize * n  # 输出数组
+            self.frames.alloc(nbytes)
+            with ProcessPoolExecutor(self.workers) as pool:
+                yield from self._parallel_sort(pool, data, out, [(m.name, n, source.dtype.str) for m in segments])
+            self.frames.free(nbytes)
+            return out.copy()
+        finally:
+            data = out = None
+            views.clear()
+            for m in segments:
+                m.unlink()
+                try:
+                    m.close()
+                except BufferError:
+                    pass  # 出错时回溯中仍引用着视图，映射随视图回收时释放
+
+    def _parallel_sort(self, pool, data, out, specs):
+        """
+        两个阶段的并行排序：第一阶段各进程处理 data 中的一段，第二阶段各进程写出 out 中的一段。
+
+        :param specs: data 和 out 两块共享内存的 (名字, 元素个数, dtype)
+        """
+        n, p = len(data), self.workers
+        view = np.array(self.data)  # 采样位置上的当前值
+        owners = {}  # 进程号 -> 动画中的进程编号
+        self.tasks.clear()  # 重新记录（拷贝与原对象共用同一个列表）
+        starts = [n * i // p for i in range(p + 1)]
+        chunks = list(zip(starts, starts[1:]))
+
+        # 第一阶段：各段排序（归并）或按桶重排（样本排序）
+        if self.method == 'merge':
+            futures = {pool.submit(_sort_range, specs[0], a, b, self.kernel): i for i, (a, b) in enumerate(chunks)}
+        else:
+            splitters = self._sample_splitters(data)
+            futures = {pool.submit(_partition_range, specs[0], a, b, splitters): i for i, (a, b) in enumerate(chunks)}
+        counts = [None] * p  # 样本排序中各段各桶的元素个数
+        for future in as_completed(futures):
+            i = futures[future]
+            a, b = chunks[i]
+            pid = future.result()
+            if self.method == 'sample':
+                pid, counts[i] = pid
+            yield from self._show(view, data, a, b, owners.setdefault(pid, len(owners)),
+                                  'run' if self.method == 'merge' else 'partition')
+        yield self.frames.mark(0, len(view) - 1, -1, label='pass')
+
+        # 每一段切成 p 份的边界：bounds[i][j] 到 bounds[i][j + 1] 是第 i 段的第 j 份
+        if self.method == 'merge':
+            splitters = self._run_splitters(data, chunks)
+            bounds = [[a] + (np.searchsorted(data[a:b], splitters, side='left') + a).tolist() + [b]
+                      for a, b in chunks]
+        else:
+            bounds = [(a + np.concatenate([[0], np.cumsum(c)])).tolist() for (a, b), c in zip(chunks, counts)]
+
+        # 第二阶段：第 j 个进程合并（或排序）各段的第 j 份，写入 out 的连续区间
+        kernel = 'stable' if self.method == 'merge' else self.kernel
+        futures, offset = {}, 0
+        for j in range(p):
+            parts = [(row[j], row[j + 1]) for row in bounds]
+            size = sum(b - a for a, b in parts)
+            futures[pool.submit(_gather_range, specs[0], specs[1], parts, offset, kernel)] = (offset, offset + size)
+            offset += size
+        for future in as_completed(futures):
+            a, b = futures[future]
+            yield from self._show(view, out, a, b, owners.setdefault(future.result(), len(owners)),
+                                  'merge' if self.method == 'merge' else 'bucket')
+        yield self.frames.mark(0, len(view) - 1, -1, label='pass')
+
+    def _sample_splitters(self, data):
+        """
+        样本排序的分割值：随机抽取 oversample × p 个样本，排序后等间隔选出 p - 1 个。
+        """
+        p = self.workers
+        rng = np.random.default_rng(self.seed)
+        sample = np.sort(data[rng.integers(0, len(data), self.oversample * p)])
+        return sample[[len(sample) * j // p for j in range(1, p)]]
+
+    def _run_splitters(self, data, chunks):
+        """
+        并行归并排序的分割值：从各有序段中等间隔取 oversample 个样本，合在一起排序后等间隔选出 p - 1 个。
+        """
+        p = self.workers
+        sample = np.sort(np.concatenate([data[np.linspace(a, b - 1, self.oversample).astype(np.int64)]
+                                         for a, b in chunks if b > a]))
+        return sample[[len(sample) * j // p for j in range(1, p)]]
+
+    def _show(self, view, arr, start, stop, worker, label):
+        """
+        登记 arr[start:stop] 已由第 worker 个进程写入，记录一帧并登记到 self.tasks 中（见 SampledSortVisualizer._show）。
+        """
+        lo, hi = self._span(start, stop)
+        if lo < hi:
+            self.tasks.append((label, lo, hi - 1, worker))
+        return super()._show(view, arr, start, stop, worker, label=label)
+
+    def _style(self, frame_data):
+        """
+        返回当前帧的绘制方案。
+
+        :param frame_data: 当前帧的数据
+        :return: (数组, 高亮颜色, 顶部标注, 标题)
+        """
+        frame, first, last, worker, action = frame_data
+        colors = {}
+        title = f'Step: {len(self.frames)} - {action.upper()}'
+        if worker >= 0:
+            # 本阶段到这一帧为止完成的任务，各用完成它的进程的颜色，各进程的区间并排显示
+            task = (action, first, last, worker)
+            done = self.tasks[:self.tasks.index(task) + 1] if task in self.tasks else [task]
+            for label, a, b, w in done:
+                if label == action:
+                    colors[range(a, b + 1)] = WORKER_COLORS[w % len(WORKER_COLORS)]
+            title += f' (worker {worker})'
+        return frame, colors, [], title
+
+
+if __name__ == "__main__":
+    from .workloads import generate
+
+    # 4 个进程做样本排序，各桶的区间用不同颜色显示
+    sorter = ParallelSortVisualizer(generate('random', 200, seed=0), method='sample', workers=4)
+    sorter.animate(interval=500)
@@ -0,0 +1,238 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 按真实时间调度的自适应播放
+
+# 设计思路：
+# animate() 把帧间隔固定为 interval，每一帧都要画出来；某一帧的绘制时间超过 interval 时播放就会变慢，
+# 按 duration 算出的帧数预算也就不再对应真实的播放时长。
+# 这里按墙上时钟调度：
+# - PlaybackScheduler 只负责决定“现在该显示哪一帧”：开始播放 t 秒后应当显示第 t × speed 帧，
+#   绘制跟不上时直接跳过中间的帧，但不跳过阶段边界帧（SortTrace.boundaries）；
+#   只有剩下的边界帧按当前的绘制速度在剩余时间内画不完时（与 decimate 中边界帧超出预算的处理相同），
+#   才改为每拍显示目标位置之前最近的一个边界帧，被略过的边界帧计入 dropped_boundaries；
+#   它同时记录每帧的绘制耗时，定时器的间隔不小于最近的平均绘制耗时，不做注定来不及的重绘；
+# - AdaptivePlayback 负责绘制：一个定时器、手动 blit，每一拍向调度器要一帧来画，
+#   结束时汇报实际帧率和目标帧率（PlaybackReport）。
+# 调度器不依赖 Matplotlib，时钟可以替换，便于在没有图形界面时检验调度逻辑；
+# 与 visualizer.py 相同，Matplotlib 和 render 只在 AdaptivePlayback 创建窗口时才导入。
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+RENDER_SMOOTHING = 0.2  # 绘制耗时的指数滑动平均系数
+
+
+@dataclass
+class PlaybackReport:
+    """
+    一次播放的统计结果。
+    """
+    requested_fps: float  # 目标帧率：min(定时器帧率, 每秒步数)
+    achieved_fps: float   # 实际帧率：绘制的帧数 / 播放耗时
+    rendered: int         # 绘制的帧数
+    skipped: int          # 为了跟上进度而跳过的帧数
+    dropped_boundaries: int  # 边界帧过于密集而略过的边界帧数
+    planned: float        # 计划的播放时长（秒）
+    elapsed: float        # 实际的播放时长（秒）
+    render_ms: float      # 每帧平均绘制耗时（毫秒）
+
+
+class PlaybackScheduler:
+    """
+    按真实时间决定每一拍显示哪一帧，落后时跳帧，但总是保留阶段边界帧。
+    """
+    def __init__(self, total, speed, boundaries=None, fps=30, clock=time.perf_counter):
+        """
+        :param total: 总帧数
+        :param speed: 每秒播放的步数（帧数）
+        :param boundaries: 阶段边界帧的布尔掩码（见 SortTrace.boundaries），这些帧不会被跳过
+        :param fps: 定时器的最高帧率
+        :param clock: 返回秒数的时钟函数
+        """
+        if total < 1:
+            raise ValueError('没有可播放的帧')
+        if speed <= 0 or fps <= 0:
+            raise ValueError('播放速度和帧率必须为正数')
+        self.total = total
+        self.speed = speed
+        self.fps = fps
+        self.clock = clock
+        self.boundaries = np.zeros(0, dtype=np.int64) if boundaries is None else np.flatnonzero(boundaries)
+        self.position = -1   # 已显示的最后一帧
+        self.rendered = 0
+        self.skipped = 0
+        self.dropped_boundaries = 0
+        self.render_time = 0.0  # 绘制耗时的滑动平均（秒）
+        self._total_render = 0.0
+        self._start = None
+        self._end = None
+
+    @property
+    def done(self):
+        return self.position >= self.total - 1
+
+    @property
+    def interval(self):
+        """
+        定时器的间隔（毫秒）：不短于 1 / fps，也不短于平均绘制耗时。
+        """
+        return max(round(1000 / self.fps), round(1000 * self.render_time), 1)
+
+    def next_frame(self):
+        """
+        返回现在应当显示的帧；已经超前于计划（或已播放完）时返回 None。
+        """
+        if self.done:
+            return None
+        now = self.clock()
+        if self._start is None:
+            self._start = now
+        target = min(int((now - self._start) * self.speed), self.total - 1)
+        if target <= self.position:
+            return None
+        j = int(np.searchsorted(self.boundaries, self.position, side='right'))
+        if j < len(self.boundaries) and self.boundaries[j] < target:
+            # 剩余时间内最多还能画多少帧
+            capacity = ((self.total - 1) / self.speed - (now - self._start)) / max(self.render_time, 1 / self.fps)
+            if len(self.boundaries) - j <= capacity:
+                target = int(self.boundaries[j])  # 不跳过尚未显示的边界帧
+            else:
+                # 边界帧画不完：显示目标位置之前最近的边界帧，略过其间的其他边界帧
+                last = int(np.searchsorted(self.boundaries, target, side='right')) - 1
+                self.dropped_boundaries += last - j
+                target = int(self.boundaries[last])
+        self.skipped += target - self.position - 1
+        self.position = target
+        return target
+
+    def record(self, seconds):
+        """
+        登记刚显示的一帧的绘制耗时（秒）。
+        """
+        self.rendered += 1
+        self._total_render += seconds
+        if self.rendered == 1:
+            self.render_time = seconds
+        else:
+            self.render_time += RENDER_SMOOTHING * (seconds - self.render_time)
+        if self.done:
+            self._end = self.clock()
+
+    def report(self):
+        """
+        返回播放统计（PlaybackReport）；尚未播放完时按当前时刻计算。
+        """
+        end = self._end if self._end is not None else self.clock()
+        elapsed = end - self._start if self._start is not None else 0.0
+        return PlaybackReport(
+            requested_fps=min(self.fps, self.speed),
+            achieved_fps=self.rendered / elapsed if elapsed > 0 else 0.0,
+            rendered=self.rendered,
+            skipped=self.skipped,
+            dropped_boundaries=self.dropped_boundaries,
+            planned=(self.total - 1) / self.speed,
+            elapsed=elapsed,
+            render_ms=1000 * self._total_render / self.rendered if self.rendered else 0.0,
+        )
+
+
+class AdaptivePlayback:
+    """
+    按目标速度实时播放一条轨迹，绘制跟不上时跳帧。
+    """
+    def __init__(self, visualizer, speed=None, duration=None, fps=30, renderer='auto'):
+        """
+        :param visualizer: 已记录排序过程的可视化对象
+        :param speed: 每秒播放的步数
+        :param duration: 目标播放时长（秒），与 speed 二选一
+        :param fps: 最高帧率
+        :param renderer: 渲染方式，'bars'、'columns' 或 'auto'（见 render.make_renderer）
+        """
+        if (speed is None) == (duration is None):
+            raise ValueError('speed 和 duration 必须指定且只能指定一个')
+        frames = visualizer.frames
+        if duration is not None:
+            if duration <= 0:
+                raise ValueError('播放时长必须为正数')
+            speed = max(len(frames) - 1, 1) / duration
+        self.visualizer = visualizer
+        self.frames = frames
+        self.renderer_kind = renderer
+        self.scheduler = PlaybackScheduler(len(frames), speed, frames.boundaries(visualizer.phase_labels), fps)
+        self.fig = None
+
+    def _setup(self, fig):
+        """
+        在 fig 中创建坐标轴和渲染器，动画元素只在 blit 时绘制。
+        """
+        from .render import make_renderer
+
+        self.fig = fig
+        self.ax = fig.add_subplot()
+        self.renderer = make_renderer(self.ax, self.visualizer.data, self.renderer_kind)
+        self.renderer.draw(self.visualizer.data, title=self.visualizer.init_title)
+        for artist in self.renderer.artists:
+            artist.set_animated(True)
+        self._background = None
+        fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        """
+        窗口完整重绘后重新缓存背景，并补画当前帧。
+        """
+        self._background = self.fig.canvas.copy_from_bbox(self.ax.bbox)
+        for artist in self.renderer.artists:
+            self.ax.draw_artist(artist)
+
+    def step(self):
+        """
+        按计划显示一帧（超前于计划时不绘制）。
+
+        :return: 是否还没有播放完
+        """
+        if self._background is None:
+            self.fig.canvas.draw()
+        k = self.scheduler.next_frame()
+        if k is not None:
+            start = time.perf_counter()
+            self.visualizer._update(self.frames[k], self.renderer)
+            canvas = self.fig.canvas
+            canvas.restore_region(self._background)
+            for artist in self.renderer.artists:
+                self.ax.draw_artist(artist)
+            canvas.blit(self.ax.bbox)
+            self.scheduler.record(time.perf_counter() - start)
+        return not self.scheduler.done
+
+    def show(self):
+        """
+        打开窗口播放，结束后打印实际帧率与目标帧率。
+
+        :return: PlaybackReport（窗口关闭时的统计）
+        """
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure()
+        self._setup(fig)
+        timer = fig.canvas.new_timer(interval=self.scheduler.interval)
+
+        def tick():
+            if self.step():
+                timer.interval = self.scheduler.interval  # 绘制变慢时放慢定时器
+            else:
+                timer.stop()
+                report = self.scheduler.report()
+                print(f'目标 {report.requested_fps:.1f} fps，实际 {report.achieved_fps:.1f} fps，'
+                      f'绘制 {report.rendered} 帧，跳过 {report.skipped} 帧'
+                      f'（其中边界帧 {report.dropped_boundaries} 帧），'
+                      f'用时 {report.elapsed:.1f}/{report.planned:.1f} 秒')
+
+        timer.add_callback(tick)
+        timer.start()
+        self._timer = timer  # 保持引用，避免定时器被回收
+        plt.show()
+        return self.scheduler.report()
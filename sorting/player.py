@@ -0,0 +1,137 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 可拖动定位的交互式排序播放器
+
+# 设计思路：
+# animate() 用 FuncAnimation 从第一帧开始按顺序播放，想看归并排序的第 80000 步，只能等前面的帧全部播完。
+# SortPlayer 用滑块和键盘控制播放：
+# - 任意一帧都可以直接定位：轨迹预先建立关键帧（SortTrace.build_keyframes），
+#   定位时从最近的关键帧出发最多重放 K 条事件，耗时与轨迹总长度无关；
+# - 顺序播放和单步沿用轨迹的重放游标，每帧只重放一条事件；
+# - 定时器驱动播放，滑块既显示进度也用于定位；拖动滑块时由 draw_idle 合并重绘请求，
+#   每次界面刷新只画最新的位置，几百万步的轨迹也能跟手。
+# 按键：空格 播放/暂停，←/→ 单步，↓/↑ 后退/前进 1%，pagedown/pageup 后退/前进 10%，home/end 跳到首帧/末帧。
+
+import matplotlib.pyplot as plt
+from matplotlib.widgets import Slider
+
+from .render import make_renderer
+
+# 按键对应的跳转步数；浮点数表示占总帧数的比例
+KEY_STEPS = {
+    'right': 1,
+    'left': -1,
+    'up': 0.01,
+    'down': -0.01,
+    'pageup': 0.1,
+    'pagedown': -0.1,
+}
+
+
+class SortPlayer:
+    """
+    带滑块和键盘控制的排序过程播放器，可播放、暂停、单步和跳转到任意一帧。
+    """
+    def __init__(self, visualizer, frames, interval=50, renderer='auto'):
+        """
+        :param visualizer: 已记录排序过程的可视化对象
+        :param frames: 要播放的帧序列（SortTrace 或其 select 视图）
+        :param interval: 播放时的帧间隔（毫秒）
+        :param renderer: 渲染方式，'bars'、'columns' 或 'auto'（见 render.make_renderer）
+        """
+        if len(frames) == 0:
+            raise ValueError('没有可播放的帧')
+        self.visualizer = visualizer
+        self.frames = frames
+        self.interval = interval
+        self.renderer_kind = renderer
+        self.position = 0  # 当前显示的帧
+        self.playing = False
+        self.fig = None
+
+    def _setup(self, fig):
+        """
+        在 fig 中创建坐标轴、滑块、定时器并绑定按键。
+        """
+        self.fig = fig
+        self.ax = fig.add_axes((0.1, 0.2, 0.85, 0.72))
+        self.renderer = make_renderer(self.ax, self.visualizer.data, self.renderer_kind)
+        slider_ax = fig.add_axes((0.1, 0.05, 0.7, 0.04))
+        # 只有一帧时滑块的范围不能为空
+        self.slider = Slider(slider_ax, 'Step', 0, max(len(self.frames) - 1, 1),
+                             valinit=0, valstep=1, valfmt='%d')
+        self.slider.on_changed(self._on_slider)
+        fig.canvas.mpl_connect('key_press_event', self._on_key)
+        self.timer = fig.canvas.new_timer(interval=self.interval)
+        self.timer.add_callback(self._tick)
+        self.seek(0)
+
+    def seek(self, k):
+        """
+        显示第 k 帧（超出范围时取最近的一端）。
+        """
+        k = min(max(int(k), 0), len(self.frames) - 1)
+        self.position = k
+        self.visualizer._update(self.frames[k], self.renderer)
+        if self.slider.val != k:
+            # 同步滑块的位置，不再触发 _on_slider
+            self.slider.eventson = False
+            self.slider.set_val(k)
+            self.slider.eventson = True
+        self.fig.canvas.draw_idle()
+
+    def play(self):
+        """
+        从当前帧开始播放，已在末帧时从头播放。
+        """
+        if self.position >= len(self.frames) - 1:
+            self.seek(0)
+        self.playing = True
+        self.timer.start()
+
+    def pause(self):
+        """
+        暂停播放，停留在当前帧。
+        """
+        self.playing = False
+        self.timer.stop()
+
+    def _tick(self):
+        if self.position >= len(self.frames) - 1:
+            self.pause()
+            return
+        self.seek(self.position + 1)
+
+    def _on_slider(self, value):
+        self.seek(value)
+
+    def _on_key(self, event):
+        if event.key == ' ':
+            if self.playing:
+                self.pause()
+            else:
+                self.play()
+        elif event.key == 'home':
+            self.seek(0)
+        elif event.key == 'end':
+            self.seek(len(self.frames) - 1)
+        elif event.key in KEY_STEPS:
+            step = KEY_STEPS[event.key]
+            if isinstance(step, float):
+                # 按比例跳转时至少移动一帧
+                step = int(step * len(self.frames)) or (1 if step > 0 else -1)
+            self.seek(self.position + step)
+
+    def show(self):
+        """
+        打开窗口并进入交互式播放。
+        """
+        fig = plt.figure()
+        # 方向键、home 等默认绑定了视图的前进/后退/复位，由播放器接管
+        manager = fig.canvas.manager
+        if manager is not None and manager.key_press_handler_id is not None:
+            fig.canvas.mpl_disconnect(manager.key_press_handler_id)
+        self._setup(fig)
+        plt.show()
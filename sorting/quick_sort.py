@@ -12,106 +12,234 @@
 # 算法步骤：
 # 1. 从数组中选择一个基准元素（pivot）。
 # 2. 重新排列数组，所有比基准元素小的元素摆放在基准前面，所有比基准元素大的元素摆放在基准后面。
-# 3. 递归地对基准前后的子数组进行快速排序。
+# 3. 递归地对基准前后的子数组进行快速排序（这里用显式的栈代替递归）。
 
 # 时间复杂度分析：
 # - 平均情况下，时间复杂度为 O(n log n)。
-# - 最坏情况下（例如，每次选择的基准都是最大或最小元素），时间复杂度为 O(n^2)。
+# - 最坏情况下（例如，每次选择的基准都是最大或最小元素），时间复杂度为 O(n^2)；
+#   内省排序在划分过深时改用堆排序，最坏也是 O(n log n)。
 
 # 空间复杂度分析：
-# - 快速排序是原地排序算法，空间复杂度为 O(log n)（递归调用栈的空间）。
+# - 快速排序是原地排序算法，空间复杂度为 O(log n)（栈的空间）。
+
+# 内省排序（introsort）：
+# 总是以最后一个元素为基准时，已排序或逆序的输入每次只能分出一个元素，退化为 O(n^2)，
+# 而且递归深度达到 n，约 1000 个元素就超过 Python 的递归深度限制。这里做了以下改进：
+# - 用显式的栈代替递归，先处理左半部分，栈的深度不超过深度上限；
+# - 基准取三数中值（首、中、尾），区间较长时取九数中值（ninther），有序输入也能对半分；
+# - 三路划分（荷兰国旗问题）：小于、等于、大于基准的元素各成一段，等于基准的一段不再参与排序，
+#   重复值很多时也不会退化；
+# - 划分深度超过 2·log₂(n) 时改用堆排序，最坏情况也是 O(n log n)；
+# - 不超过 INSERTION_THRESHOLD 个元素的区间直接用插入排序（相邻交换）。
+# 记录的帧仍然只有 'swap' 和 'partitioned' 两种，原有动画无需改动。
+# 不记录（record=False）时不产生帧，交换次数在本地累加后整体 tally。
 
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import numpy as np
 
-class QuickSortVisualizer:
+from .visualizer import SortVisualizer
+
+INSERTION_THRESHOLD = 8  # 不超过该长度的区间用插入排序
+NINTHER_THRESHOLD = 40   # 超过该长度的区间用九数中值选基准
+
+class QuickSortVisualizer(SortVisualizer):
     """
     快速排序可视化类，提供分治策略排序及动画演示功能。
     """
-    def __init__(self, data):
-        self.data = list(data)
-        self.frames = []
-        self._quick_sort(self.data, 0, len(self.data) - 1)
+    phase_labels = ('partitioned',)
+
+    def _steps(self):
+        arr = list(self.data)
+        yield from self._quick_sort(arr, 0, len(arr) - 1)
+        return arr
 
     def _quick_sort(self, arr, low, high):
         """
-        递归地对数组进行快速排序，并记录排序过程中的状态。
+        用显式的栈对数组进行快速排序，并记录排序过程中的状态。
 
         :param arr: 待排序的数组
         :param low: 数组的起始索引
         :param high: 数组的结束索引
         """
-        if low < high:
-            # 获取分区点
-            pi = self._partition(arr, low, high)
+        depth_limit = 2 * max(high - low + 1, 1).bit_length()
+        trace = self.frames.recording
+        stack = [(low, high, depth_limit)]
+        while stack:
+            low, high, depth = stack.pop()
+            if high - low + 1 <= INSERTION_THRESHOLD:
+                yield from self._insertion_sort(arr, low, high)
+                continue
+            if depth == 0:
+                # 划分过深，说明基准选得不好，改用堆排序
+                yield from self._heap_sort(arr, low, high)
+                continue
+            # 获取分区点：[lt, gt] 中的元素都等于基准
+            lt, gt = yield from self._partition(arr, low, high)
             # 添加分区后的状态
-            self.frames.append((arr.copy(), low, high, pi, 'partitioned'))
-            # 递归地对左子数组进行快速排序
-            self._quick_sort(arr, low, pi - 1)
-            # 递归地对右子数组进行快速排序
-            self._quick_sort(arr, pi + 1, high)
+            if trace:
+                yield self.frames.mark(low, high, lt, label='partitioned')
+            # 先压入右子数组，保证先处理左子数组
+            stack.append((gt + 1, high, depth - 1))
+            stack.append((low, lt - 1, depth - 1))
 
     def _partition(self, arr, low, high):
         """
-        对数组进行分区，并记录交换过程中的状态。
+        以三路划分的方式对数组进行分区，并记录交换过程中的状态。
 
         :param arr: 待分区的数组
         :param low: 数组的起始索引
         :param high: 数组的结束索引
-        :return: 分区点的索引
+        :return: 等于基准的一段的起止索引 (lt, gt)
         """
-        pivot = arr[high]  # 选择最后一个元素作为基准
-        i = low - 1
-        for j in range(low, high):
-            if arr[j] <= pivot:
-                i += 1
-                arr[i], arr[j] = arr[j], arr[i]
+        trace = self.frames.recording  # 只计数（record=False）时不 yield，交换次数在本地累加
+        p = self._pivot(arr, low, high)
+        swaps = 0
+        if p != low:
+            arr[low], arr[p] = arr[p], arr[low]
+            if trace:
+                yield self.frames.swap(low, p, label='swap')
+            else:
+                swaps += 1
+        pivot = arr[low]
+        # [low, lt) < pivot，[lt, i) == pivot，(gt, high] > pivot
+        lt, i, gt = low, low + 1, high
+        comparisons = 0
+        while i <= gt:
+            if arr[i] < pivot:
+                comparisons += 1
+                arr[lt], arr[i] = arr[i], arr[lt]
                 # 添加交换后的状态
-                self.frames.append((arr.copy(), i, j, 'swap'))
-        arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        # 添加交换后的状态
-        self.frames.append((arr.copy(), i + 1, high, 'swap'))
-        return i + 1
+                if trace:
+                    yield self.frames.swap(lt, i, label='swap')
+                else:
+                    swaps += 1
+                lt += 1
+                i += 1
+            elif arr[i] > pivot:
+                comparisons += 2
+                arr[i], arr[gt] = arr[gt], arr[i]
+                if trace:
+                    yield self.frames.swap(i, gt, label='swap')
+                else:
+                    swaps += 1
+                gt -= 1
+            else:
+                comparisons += 2
+                i += 1
+        self.frames.tally(comparisons=comparisons, swaps=swaps)
+        return lt, gt
+
+    def _pivot(self, arr, low, high):
+        """
+        选择基准：区间较短时取首、中、尾三个元素的中值，较长时取九数中值。
+
+        :return: 基准的索引
+        """
+        mid = (low + high) // 2
+        if high - low + 1 <= NINTHER_THRESHOLD:
+            return self._median3(arr, low, mid, high)
+        step = (high - low + 1) // 8
+        return self._median3(arr,
+                             self._median3(arr, low, low + step, low + 2 * step),
+                             self._median3(arr, mid - step, mid, mid + step),
+                             self._median3(arr, high - 2 * step, high - step, high))
+
+    def _median3(self, arr, a, b, c):
+        """
+        返回 arr[a]、arr[b]、arr[c] 中值的索引，并统计比较次数。
+        """
+        self.frames.tally(comparisons=2)
+        if arr[a] < arr[b]:
+            if arr[b] < arr[c]:
+                return b
+            self.frames.tally(comparisons=1)
+            return c if arr[a] < arr[c] else a
+        if arr[a] < arr[c]:
+            return a
+        self.frames.tally(comparisons=1)
+        return c if arr[b] < arr[c] else b
+
+    def _insertion_sort(self, arr, low, high):
+        """
+        用相邻交换的插入排序对区间 [low, high] 排序。
+        """
+        trace = self.frames.recording
+        comparisons = swaps = 0
+        for i in range(low + 1, high + 1):
+            j = i
+            while j > low:
+                comparisons += 1
+                if arr[j - 1] <= arr[j]:
+                    break
+                arr[j - 1], arr[j] = arr[j], arr[j - 1]
+                if trace:
+                    yield self.frames.swap(j - 1, j, label='swap')
+                else:
+                    swaps += 1
+                j -= 1
+        self.frames.tally(comparisons=comparisons, swaps=swaps)
+
+    def _heap_sort(self, arr, low, high):
+        """
+        对区间 [low, high] 进行堆排序。
+        """
+        size = high - low + 1
+        # 建立大顶堆
+        for root in range(size // 2 - 1, -1, -1):
+            yield from self._sift_down(arr, low, root, size)
+        # 依次把堆顶（最大值）换到末尾
+        for end in range(size - 1, 0, -1):
+            arr[low], arr[low + end] = arr[low + end], arr[low]
+            if self.frames.recording:
+                yield self.frames.swap(low, low + end, label='swap')
+            else:
+                self.frames.tally(swaps=1)
+            yield from self._sift_down(arr, low, 0, end)
+
+    def _sift_down(self, arr, low, root, size):
+        """
+        在以 arr[low] 为根、长度为 size 的堆中，把 root 处的元素下沉到合适位置。
+        """
+        trace = self.frames.recording
+        comparisons = swaps = 0
+        while True:
+            child = 2 * root + 1
+            if child >= size:
+                break
+            if child + 1 < size:
+                comparisons += 1
+                if arr[low + child] < arr[low + child + 1]:
+                    child += 1
+            comparisons += 1
+            if arr[low + root] >= arr[low + child]:
+                break
+            arr[low + root], arr[low + child] = arr[low + child], arr[low + root]
+            if trace:
+                yield self.frames.swap(low + root, low + child, label='swap')
+            else:
+                swaps += 1
+            root = child
+        self.frames.tally(comparisons=comparisons, swaps=swaps)
 
-    def _update(self, frame_data, ax):
+    def _style(self, frame_data):
         """
-        更新动画帧，绘制当前排序状态。
+        返回当前帧的绘制方案。
 
         :param frame_data: 当前帧的数据
-        :param ax: Matplotlib 的 Axes 对象
+        :return: (数组, 高亮颜色, 顶部标注, 标题)
         """
         if len(frame_data) == 5:
             # 分区后的状态
             frame, low, high, pi, action = frame_data
-            ax.clear()
-            bars = ax.bar(range(len(frame)), frame, color=['blue'] * len(frame))
-            for i in range(low, high + 1):
-                bars[i].set_color('green')  # 分区范围
-            bars[pi].set_color('red')  # 分区点
+            colors = {range(low, high + 1): 'green',  # 分区范围
+                      pi: 'red'}  # 分区点
             # 添加星号标记
-            ax.annotate('*', (pi, frame[pi]), ha='center', va='bottom', fontsize=12, color='brown')
-            ax.set_ylim(0, max(self.data) + 1)
-            ax.set_title(f'Step: {len(self.frames)} - {action.upper()}')
+            markers = [(pi, '*', 'brown')]
         else:
             # 交换过程中的状态
             frame, idx1, idx2, action = frame_data
-            ax.clear()
-            bars = ax.bar(range(len(frame)), frame, color=['blue'] * len(frame))
-            bars[idx1].set_color('red')
-            bars[idx2].set_color('yellow')
-            ax.annotate('⬆', (idx1, frame[idx1]), ha='center', va='bottom', fontsize=12, color='red')
-            ax.annotate('⬆', (idx2, frame[idx2]), ha='center', va='bottom', fontsize=12, color='red')
-            ax.set_ylim(0, max(self.data) + 1)
-            ax.set_title(f'Step: {len(self.frames)} - {action.upper()}')
-
-    def animate(self):
-        """
-        运行动画，展示排序过程。
-        """
-        fig, ax = plt.subplots()
-        ani = animation.FuncAnimation(fig, self._update, frames=self.frames, fargs=(ax,), interval=500, repeat=False)
-        plt.show()
+            colors = {idx1: 'red', idx2: 'yellow'}
+            markers = [(idx1, '⬆', 'red'), (idx2, '⬆', 'red')]
+        return frame, colors, markers, f'Step: {len(self.frames)} - {action.upper()}'
 
 if __name__ == "__main__":
     data = np.random.randint(1, 20, 10)
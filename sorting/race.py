@@ -0,0 +1,191 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 多种排序算法在同一组数据上的同屏对比（竞速）
+
+# 设计思路：
+# 原先要比较几种算法，只能分别运行各模块的 animate()，每个窗口各有一个定时器，无法同步。
+# SortRace 把同一组数据交给多个可视化类：
+# - 用进程池并行记录各算法的排序轨迹（SortTrace 可序列化，记录完成后传回主进程）；
+# - 在一个窗口中按网格排列各个子图，每个子图一个渲染器（数据较多时自动改用按像素列聚合的 ColumnRenderer），另有一个步数计数器；
+# - 只用一个定时器驱动所有子图，每一拍各子图前进一帧，因此各算法的步数可以直接比较；
+# - 手动 blit：每个子图缓存自己的背景，每一拍只恢复并重绘仍在进行的子图，
+#   已经结束的子图不再重绘，停留在最后一帧；窗口重绘（如改变大小）后重新缓存背景并补画所有子图。
+# 子图越多，已结束的子图越多，每一拍的绘制量反而越少，六个以上的子图也能保持流畅。
+# Matplotlib 只在创建窗口和子图时才导入，只记录轨迹（如在批处理中构造 SortRace）时不需要它。
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _build(algorithm, data):
+    """
+    在工作进程中记录一种算法的排序过程，返回可视化对象。
+    """
+    return algorithm(data)
+
+
+def _name(algorithm):
+    """
+    算法的显示名称：类名，functools.partial 时附上参数。
+    """
+    func = getattr(algorithm, 'func', None)
+    if func is None:
+        return getattr(algorithm, '__name__', str(algorithm))
+    args = ', '.join(f'{key}={value!r}' for key, value in algorithm.keywords.items())
+    return f'{func.__name__}({args})' if args else func.__name__
+
+
+class SortRace:
+    """
+    多种排序算法在同一组数据上的同步对比播放。
+    """
+    def __init__(self, data, algorithms, workers=None, max_frames=None, strategy='uniform', renderer='auto'):
+        """
+        :param data: 待排序的数组
+        :param algorithms: 可视化类（或 functools.partial 包装的带参数的可视化类）的列表
+        :param workers: 并行记录轨迹的进程数，默认为 CPU 核数与算法数中的较小值；为 1 时在当前进程中记录
+        :param max_frames: 每种算法最多播放的帧数，超出时按 strategy 抽稀（见 SortVisualizer.animate）
+        :param strategy: 抽稀方式，'uniform' 或 'importance'
+        :param renderer: 渲染方式，'bars'、'columns' 或 'auto'（见 render.make_renderer）
+        """
+        if not algorithms:
+            raise ValueError('至少需要一种算法')
+        self.data = list(data)
+        self.names = [_name(algorithm) for algorithm in algorithms]
+        workers = workers or min(len(algorithms), os.cpu_count() or 1)
+        if workers == 1:
+            self.visualizers = [_build(algorithm, self.data) for algorithm in algorithms]
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                self.visualizers = list(pool.map(_build, algorithms, [self.data] * len(algorithms)))
+        self.frames = [visualizer._budget_frames(visualizer.frames, max_frames, None, 1, strategy)
+                       for visualizer in self.visualizers]
+        self.renderer = renderer
+        self.fig = None
+
+    def _setup(self, fig, ncols=None):
+        """
+        在 fig 中按网格创建各子图及其渲染器。
+        """
+        from .render import make_renderer
+
+        count = len(self.visualizers)
+        ncols = ncols or math.ceil(math.sqrt(count))
+        nrows = math.ceil(count / ncols)
+        self.fig = fig
+        self.axes = [fig.add_subplot(nrows, ncols, k + 1) for k in range(count)]
+        for ax, name in zip(self.axes, self.names):
+            ax.set_title(name, fontsize=10)
+        # 先确定布局，渲染器按子图最终的像素宽度选择方式和列数
+        fig.tight_layout()
+        self.renderers = []
+        self.counters = []
+        for ax, visualizer in zip(self.axes, self.visualizers):
+            renderer = make_renderer(ax, self.data, self.renderer)
+            renderer.draw(self.data, title=visualizer.init_title)
+            counter = ax.text(0.98, 0.98, '', transform=ax.transAxes, ha='right', va='top')
+            for artist in renderer.artists + [counter]:
+                artist.set_animated(True)
+            self.renderers.append(renderer)
+            self.counters.append(counter)
+        self.positions = [0] * count  # 各子图已播放的帧数
+        self._update_counters()
+        self._backgrounds = None
+        fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _update_counters(self):
+        for counter, position, frames in zip(self.counters, self.positions, self.frames):
+            done = ' ✓' if position >= len(frames) else ''
+            counter.set_text(f'{position}/{len(frames)}{done}')
+
+    def _artists(self, k):
+        return self.renderers[k].artists + [self.counters[k]]
+
+    def _on_draw(self, event):
+        """
+        窗口完整重绘后重新缓存各子图的背景，并补画所有子图的当前状态。
+        """
+        canvas = self.fig.canvas
+        self._backgrounds = [canvas.copy_from_bbox(ax.bbox) for ax in self.axes]
+        for k, ax in enumerate(self.axes):
+            for artist in self._artists(k):
+                ax.draw_artist(artist)
+
+    def step(self):
+        """
+        所有未结束的子图各前进一帧并重绘。
+
+        :return: 是否还有未结束的子图
+        """
+        if self._backgrounds is None:
+            self.fig.canvas.draw()
+        canvas = self.fig.canvas
+        active = [k for k, frames in enumerate(self.frames) if self.positions[k] < len(frames)]
+        for k in active:
+            visualizer, frames = self.visualizers[k], self.frames[k]
+            visualizer._update(frames[self.positions[k]], self.renderers[k])
+            self.positions[k] += 1
+        self._update_counters()
+        # 只恢复并重绘本拍有变化的子图
+        for k in active:
+            ax = self.axes[k]
+            canvas.restore_region(self._backgrounds[k])
+            for artist in self._artists(k):
+                ax.draw_artist(artist)
+            canvas.blit(ax.bbox)
+        return any(self.positions[k] < len(self.frames[k]) for k in active)
+
+    def animate(self, interval=50, ncols=None):
+        """
+        在一个窗口中同步播放各算法的排序过程。
+
+        :param interval: 帧间隔（毫秒）
+        :param ncols: 网格的列数，默认接近正方形排列
+        """
+        count = len(self.visualizers)
+        ncols = ncols or math.ceil(math.sqrt(count))
+        nrows = math.ceil(count / ncols)
+        import matplotlib.pyplot as plt
+
+        fig = plt.figure(figsize=(4 * ncols, 3 * nrows))
+        self._setup(fig, ncols)
+        timer = fig.canvas.new_timer(interval=interval)
+
+        def tick():
+            if not self.step():
+                timer.stop()
+
+        timer.add_callback(tick)
+        timer.start()
+        self._timer = timer  # 保持引用，避免定时器被回收
+        plt.show()
+
+
+def race(data, algorithms, interval=50, ncols=None, **kwargs):
+    """
+    在一个窗口中同步播放多种算法对同一组数据的排序过程。
+
+    :param data: 待排序的数组
+    :param algorithms: 可视化类（或 functools.partial 包装的带参数的可视化类）的列表
+    :param interval: 帧间隔（毫秒）
+    :param ncols: 网格的列数
+    :param kwargs: 其余参数见 SortRace
+    :return: SortRace 对象
+    """
+    sort_race = SortRace(data, algorithms, **kwargs)
+    sort_race.animate(interval=interval, ncols=ncols)
+    return sort_race
+
+
+if __name__ == "__main__":
+    import numpy as np
+
+    from . import (BubbleSort, BucketSortVisualizer, CountingSortVisualizer, InsertionSortVisualizer,
+                   MergeSortVisualizer, QuickSortVisualizer, RadixSortVisualizer)
+
+    race(np.random.randint(1, 50, 30),
+         [BubbleSort, InsertionSortVisualizer, MergeSortVisualizer, QuickSortVisualizer,
+          CountingSortVisualizer, RadixSortVisualizer, BucketSortVisualizer])
@@ -11,12 +11,12 @@
 # 基数排序通常使用稳定排序算法（如计数排序）作为子过程。
 
 # 算法步骤：
-# 1. 找出最大值：确定数组中最大的元素，以便确定需要处理的最大位数。
+# 1. 找出最大值：确定数组中最大的元素（有负数时为 最大值 - 最小值），以便确定需要处理的最大位数。
 # 2. 按位处理：从最低有效位（LSD）到最高有效位（MSD），依次对每一位进行排序。
 # 3. 使用稳定排序算法：在每一步中使用稳定排序算法（如计数排序）对当前位进行排序。
 
 # 时间复杂度分析：
-# - 平均情况：O(d * (n + k))，其中 d 是数字的最大位数，n 是输入数组的大小，k 是基数（通常是 10）。
+# - 平均情况：O(d * (n + k))，其中 d 是数字的最大位数，n 是输入数组的大小，k 是基数（默认是 10）。
 # - 最坏情况：O(d * (n + k))。
 # - 最好情况：O(d * (n + k))。
 
@@ -24,22 +24,105 @@
 # - 基数排序需要额外的空间来存储计数数组和输出数组，空间复杂度为 O(n + k)。
 
 # 适用场景：
-# - 数据是非负整数。
+# - 数据是整数。
 # - 数据范围较大但位数不是特别多。
 # - 需要稳定的排序算法（即相同元素的相对顺序保持不变）。
 
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+# 基数与负数：
+# - 基数 radix 可选，默认 10 便于演示；取 2 的幂（16、256、2048、65536）时每一位对应固定的若干个二进制位，
+#   32 位的键用 65536 只需 2 轮、用 256 只需 4 轮，而十进制需要 10 轮。
+# - 有负数时先把所有键减去最小值，变成保持大小顺序的非负整数再按位排序
+#   （对补码整数来说，相当于翻转符号位后再减去最小值），轮数只取决于数据范围。
+
+# NumPy 引擎（engine='numpy'）：
+# 每一轮都向量化：取出当前位的数字，np.bincount 统计各数字出现的次数（用于记录帧和统计），
+# 累加计数和稳定的分配合起来由 np.argsort(kind='stable') 完成
+# （数字不超过 16 位，NumPy 内部即是 O(n) 的计数分配），不必单独求累加计数。
+# 初始数据保存为数组（见 _prepare），整个过程不经过 Python 列表，结果也是数组。
+# 记录过程时每一轮只产生 'count'、'accumulate'、'build'、'copy' 四帧，操作计数与逐元素版本相同。
+
 import numpy as np
 
-class RadixSortVisualizer:
+from .trace import AUX
+from .visualizer import SortVisualizer
+
+def radix_passes(values, radix):
+    """
+    NumPy 向量化的 LSD 基数排序，逐轮进行，每一轮结束后 yield (当前位上各数字的计数, 本轮分配后的数组)。
+    不记录帧，可单独作为排序内核使用（如 parallel_sort 中各工作进程对桶排序），最后一次 yield 的数组即排序结果。
+
+    :param values: 待排序的整数数组（不会被修改）
+    :param radix: 基数，2 到 65536；取 2 的幂时用移位和掩码取数字
+    """
+    if not len(values):
+        return
+    bias = min(int(values.min()), 0)
+    # 在 uint64 上做减法（按 2⁶⁴ 取模），范围不超过 2⁶⁴ 时得到保持顺序的非负键
+    keys = values.astype(np.uint64) - np.uint64(bias % 2 ** 64)
+    max_key = int(keys.max())
+    # 基数为 2 的幂时用移位和掩码取数字，比除法快
+    bits = radix.bit_length() - 1 if radix & (radix - 1) == 0 else None
+    exp = 1
+    while max_key // exp > 0:
+        if bits is not None:
+            shift = exp.bit_length() - 1
+            digits = (keys >> np.uint64(shift)) & np.uint64(radix - 1)
+        else:
+            digits = keys // np.uint64(exp) % np.uint64(radix)
+        digits = digits.astype(np.uint16)
+        count = np.bincount(digits, minlength=radix)
+        order = np.argsort(digits, kind='stable')  # 稳定分配
+        keys, values = keys[order], values[order]
+        yield count, values
+        exp *= radix
+
+
+def radix_sort_array(values, radix=2 ** 16):
+    """
+    返回 values 排好序的副本（NumPy 向量化的基数排序，稳定）。
+    """
+    result = values
+    for _, result in radix_passes(values, radix):
+        pass
+    return np.array(result)
+
+
+class RadixSortVisualizer(SortVisualizer):
     """
     基数排序可视化类，提供非比较型整数排序及动画演示功能。
     """
-    def __init__(self, data):
-        self.data = list(data)
-        self.frames = []
-        self._radix_sort(self.data)
+    init_title = 'Step: 0 - INIT'
+    radix = 10
+    engine = 'python'
+
+    def __init__(self, data, radix=10, engine='python', **kwargs):
+        """
+        :param data: 待排序的数组
+        :param radix: 基数，至少为 2；取 2 的幂时按二进制位取数字
+        :param engine: 'python'（逐元素记录）或 'numpy'（向量化，每一轮四帧）
+        :param kwargs: 其余参数见 SortVisualizer
+        """
+        if radix < 2:
+            raise ValueError('基数至少为 2')
+        if engine not in ('python', 'numpy'):
+            raise ValueError(f'未知的基数排序引擎: {engine}')
+        if engine == 'numpy' and radix > 2 ** 16:
+            raise ValueError('NumPy 引擎的基数不能超过 65536')
+        self.radix = radix
+        self.engine = engine
+        super().__init__(data, **kwargs)
+
+    def _prepare(self, data):
+        if self.engine == 'numpy':
+            return np.array(data)  # 向量化引擎直接在数组上运行，不转换为列表
+        return super()._prepare(data)
+
+    def _steps(self):
+        if self.engine == 'numpy':
+            return (yield from self._radix_sort_numpy(self.data))
+        arr = list(self.data)
+        yield from self._radix_sort(arr)
+        return arr
 
     def _radix_sort(self, arr):
         """
@@ -50,95 +133,108 @@ class RadixSortVisualizer:
         if not arr:
             return
 
-        # 找出数组中的最大值
-        max_value = max(arr)
+        # 有负数时按 元素 - 最小值 取各位数字
+        bias = min(int(min(arr)), 0)
+        # 找出键的最大值（转成 Python 整数计算，避免 NumPy 整数溢出）
+        max_key = int(max(arr)) - bias
         exp = 1  # 从最低有效位开始
 
-        while max_value // exp > 0:
-            self._counting_sort(arr, exp)
-            exp *= 10
+        while max_key // exp > 0:
+            yield from self._counting_sort(arr, exp, bias)
+            exp *= self.radix
 
-    def _counting_sort(self, arr, exp):
+    def _counting_sort(self, arr, exp, bias=0):
         """
         对数组按指定位进行计数排序，并记录排序过程中的状态。
 
         :param arr: 待排序的数组
-        :param exp: 当前处理的位数（1, 10, 100, ...）
+        :param exp: 当前处理的位数（1, radix, radix², ...）
+        :param bias: 取数字前从元素中减去的偏移量
         """
         n = len(arr)
+        radix = self.radix
         # 初始化计数数组
-        count = [0] * 10
+        count = [0] * radix
         # 初始化输出数组
         output = [0] * n
+        nbytes = 8 * len(count) + self.frames.itemsize * n  # 计数器按 8 字节计
+        self.frames.alloc(nbytes)
+
+        trace = self.frames.recording  # 只计数（record=False）时不 yield，写入次数整段统计
 
         # 统计每个元素在当前位上的数字出现的次数
         for i in range(n):
-            index = arr[i] // exp
-            count[index % 10] += 1
-            self.frames.append((arr.copy(), i, 'count'))
+            index = (int(arr[i]) - bias) // exp
+            count[index % radix] += 1
+            if not trace:
+                continue
+            if i == 0:
+                yield self.frames.fill(0, i, label='count')  # 每一轮的输出数组都从全 0 开始
+            else:
+                yield self.frames.mark(i, label='count')
 
         # 累加计数数组
-        for i in range(1, 10):
+        for i in range(1, radix):
             count[i] += count[i - 1]
-            self.frames.append((arr.copy(), i, 'accumulate'))
+            if trace:
+                yield self.frames.mark(i, label='accumulate')
 
         # 构建输出数组
         for i in range(n - 1, -1, -1):
-            index = arr[i] // exp
-            output[count[index % 10] - 1] = arr[i]
-            count[index % 10] -= 1
-            self.frames.append((output.copy(), i, 'build'))
+            index = (int(arr[i]) - bias) // exp % radix
+            output[count[index] - 1] = arr[i]
+            count[index] -= 1
+            if trace:
+                yield self.frames.write(count[index], arr[i], i, label='build', buf=AUX)
 
         # 复制回原数组
-        for i in range(n):
-            arr[i] = output[i]
-            self.frames.append((arr.copy(), i, 'copy'))
+        if trace:
+            for i in range(n):
+                arr[i] = output[i]
+                yield self.frames.write(i, output[i], label='copy')
+        else:
+            arr[:] = output
+            self.frames.tally(writes=2 * n)  # 构建和复制各写入 n 次
+        self.frames.free(nbytes)
+
+    def _radix_sort_numpy(self, values):
+        """
+        用 NumPy 向量化地进行基数排序，每一轮记录四帧。
 
-    def _update(self, frame_data, ax):
+        :param values: 待排序的数组（不会被修改）
+        :return: 排好序的新数组
         """
-        更新动画帧，绘制当前排序状态。
+        nbytes = 8 * self.radix + self.frames.itemsize * len(values)
+        for count, values in radix_passes(values, self.radix):
+            self.frames.alloc(nbytes)
+            # 整段操作，不高亮单个柱子
+            yield self.frames.mark(-1, label='count')  # 统计当前位上各数字出现的次数
+            yield self.frames.mark(-1, label='accumulate')  # 累加计数，数字 d 的元素占据输出数组的一段
+            yield self.frames.assign(values, -1, label='build', buf=AUX)  # 稳定分配
+            yield self.frames.assign(values, -1, label='copy')  # 复制回原数组
+            self.frames.free(nbytes)
+        return values.copy()  # 没有任何一轮时（空数组或全为 0）values 仍是初始数据
+
+    def _style(self, frame_data):
+        """
+        返回当前帧的绘制方案。
 
         :param frame_data: 当前帧的数据
-        :param ax: Matplotlib 的 Axes 对象
+        :return: (数组, 高亮颜色, 顶部标注, 标题)
         """
         frame, idx, action = frame_data
-        ax.clear()
-        bars = ax.bar(range(len(frame)), frame, color=['blue'] * len(frame))
-
-        if 0 <= idx < len(bars):  # 确保 idx 在 bars 可访问范围内
+        colors = {}
+        if 0 <= idx < len(frame):  # 确保 idx 在柱子的索引范围内
             if action == 'count':
-                bars[idx].set_color('red')  # 标记当前操作的元素
+                colors[idx] = 'red'  # 标记当前操作的元素
             elif action == 'accumulate':
-                bars[idx].set_color('orange')  # 标记累加计数的索引
+                colors[idx] = 'orange'  # 标记累加计数的索引
             elif action == 'build':
-                bars[idx].set_color('green')  # 标记构建输出数组的元素
+                colors[idx] = 'green'  # 标记构建输出数组的元素
             elif action == 'copy':
-                bars[idx].set_color('purple')  # 标记复制回原数组的元素
-
-        ax.set_ylim(0, max(self.data) + 1)
-        ax.set_title(f'Step: {len(self.frames)} - {action.upper()}')
+                colors[idx] = 'purple'  # 标记复制回原数组的元素
 
-    def _init_draw(self, ax):
-        """
-        初始化动画帧。
-
-        :param ax: Matplotlib 的 Axes 对象
-        """
-        ax.clear()
-        bars = ax.bar(range(len(self.data)), self.data, color=['blue'] * len(self.data))
-        ax.set_ylim(0, max(self.data) + 1)
-        ax.set_title('Step: 0 - INIT')
-        return bars
-
-    def animate(self):
-        """
-        运行动画，展示排序过程。
-        """
-        fig, ax = plt.subplots()
-        ani = animation.FuncAnimation(fig, self._update, frames=self.frames, 
-                                      init_func=lambda: self._init_draw(ax), 
-                                      fargs=(ax,), interval=500, repeat=False)
-        plt.show()
+        return frame, colors, [], f'Step: {len(self.frames)} - {action.upper()}'
 
 if __name__ == "__main__":
     data = np.random.randint(1, 200, 10)  # 生成 10 个随机整数，范围在 1 到 200 之间
@@ -0,0 +1,38 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 排序算法注册表
+
+# 设计思路：
+# 命令行（python -m sorting）和基准测试（sorting.benchmark）都按名字选择算法，
+# 名字到可视化类的映射集中放在这里，两处共用，新增算法只需在此登记一次（数据分布见 workloads.py）。
+# 带参数的变体（如 NumPy 引擎、二分插入）用 functools.partial 登记。
+# 本模块只依赖 NumPy 和各排序模块，不导入 Matplotlib。
+
+import functools
+
+from .bubble_sort import BubbleSort
+from .bucket_sort import BucketSortVisualizer
+from .counting_sort import CountingSortVisualizer
+from .insertion_sort import InsertionSortVisualizer
+from .merge_sort import MergeSortVisualizer
+from .parallel_sort import ParallelSortVisualizer
+from .quick_sort import QuickSortVisualizer
+from .radix_sort import RadixSortVisualizer
+
+ALGORITHMS = {
+    'bubble': BubbleSort,
+    'insertion': InsertionSortVisualizer,
+    'insertion_binary': functools.partial(InsertionSortVisualizer, binary=True),
+    'merge': MergeSortVisualizer,
+    'quick': QuickSortVisualizer,
+    'counting': CountingSortVisualizer,
+    'counting_numpy': functools.partial(CountingSortVisualizer, engine='numpy'),
+    'radix': RadixSortVisualizer,
+    'radix_numpy': functools.partial(RadixSortVisualizer, radix=256, engine='numpy'),
+    'bucket': BucketSortVisualizer,
+    'parallel_merge': functools.partial(ParallelSortVisualizer, method='merge'),
+    'parallel_sample': ParallelSortVisualizer,
+    'parallel_radix': functools.partial(ParallelSortVisualizer, kernel='radix'),
+}
@@ -0,0 +1,240 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 复用图形元素的柱状图渲染器
+
+# 设计思路：
+# 原先每一帧都 ax.clear() 后重新 ax.bar() 创建全部柱子，并重新计算 y 轴范围，
+# 几百根柱子时播放就只有几帧每秒。
+# BarRenderer 只在开始时创建一次柱子、标注和标题，之后每帧只修改高度或颜色发生变化的柱子，
+# 配合 FuncAnimation(blit=True) 只重绘坐标轴内的动画元素。
+# 全部柱子放在同一个 PolyCollection 中，每帧一次绘制调用，而不是每根柱子一个 Rectangle。
+#
+# 元素数达到上万时，大部分柱子窄于一个像素，逐根绘制既看不清又慢（每帧的开销与 n 成正比）。
+# ColumnRenderer 按屏幕像素把元素分成若干列，每列只画一条竖线：
+# - 用 np.minimum.reduceat / np.maximum.reduceat 一次算出每列的最小值和最大值，
+#   浅色竖线从 0 画到最大值（与柱子的外形相同），深色竖线从最小值画到最大值（列内的离散程度），
+#   已排好的区域深色线很短，未排好的区域是整块深色；
+# - 全部竖线放在同一个 LineCollection 中，每帧的绘制量只取决于坐标轴的像素宽度，与 n 无关；
+# - 高亮的单个元素用一个散点图叠加在最上层；高亮的区间（颜色字典中以 range 为键）直接给所在的列着色，
+#   不必把百万个索引逐个展开。
+# make_renderer 在元素数超过坐标轴像素宽度时自动选用 ColumnRenderer。
+
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
+
+
+class BarRenderer:
+    """
+    柱状图渲染器，柱子只创建一次，每帧只更新发生变化的柱子。
+    """
+    def __init__(self, ax, data, color='blue', width=0.8):
+        """
+        :param ax: Matplotlib 的 Axes 对象
+        :param data: 初始数组
+        :param color: 柱子的默认颜色
+        :param width: 柱子的宽度
+        """
+        data = np.asarray(data)
+        n = len(data)
+        self.ax = ax
+        self.color = to_rgba(color)
+        self.heights = data.copy()
+        # 全部柱子放在同一个 PolyCollection 中，一次绘制调用即可画完
+        x = np.arange(n)
+        verts = np.zeros((n, 4, 2))
+        verts[:, :2, 0] = (x - width / 2)[:, None]
+        verts[:, 2:, 0] = (x + width / 2)[:, None]
+        verts[:, 1:3, 1] = data[:, None]
+        self.facecolors = np.tile(self.color, (n, 1))
+        self.bars = PolyCollection(verts, facecolors=self.facecolors, linewidths=0)
+        ax.add_collection(self.bars)
+        ax.set_xlim(-1, max(n, 1))
+        if n:
+            ax.set_ylim(min(0, data.min()), data.max() + 1)
+        self._paths = self.bars.get_paths()
+        self.colors = {}   # 当前被高亮的柱子：{索引: 颜色}
+        self.markers = []  # 柱子顶部的标注文字，按需增加并复用
+        # 标题放在坐标轴内部，blit 时才能被正确擦除和重绘
+        self.title = ax.text(0.02, 0.98, '', transform=ax.transAxes, ha='left', va='top')
+        self.artists = [self.bars, self.title]
+        self._grow_markers(2)
+
+    def _grow_markers(self, count):
+        while len(self.markers) < count:
+            text = self.ax.text(0, 0, '', ha='center', va='bottom', fontsize=12, visible=False)
+            self.markers.append(text)
+            self.artists.append(text)
+
+    def draw(self, frame, colors=None, markers=(), title=None):
+        """
+        绘制一帧。
+
+        :param frame: 当前数组
+        :param colors: 需要高亮的柱子 {索引或 range: 颜色}，其余柱子恢复默认颜色
+        :param markers: 柱子顶部的标注 [(索引, 符号, 颜色), ...]
+        :param title: 标题文字
+        :return: 需要重绘的图形元素列表（供 blit 使用）
+        """
+        frame = np.asarray(frame)
+        # 只更新高度发生变化的柱子
+        changed = np.flatnonzero(frame != self.heights)
+        for i in changed.tolist():
+            self._paths[i].vertices[1:3, 1] = frame[i]
+        self.heights[changed] = frame[changed]
+
+        # 先恢复上一帧高亮、本帧不再高亮的柱子，再设置本帧的高亮
+        colors = _expand(colors or {})
+        for i in self.colors.keys() - colors.keys():
+            self.facecolors[i] = self.color
+        for i, color in colors.items():
+            if self.colors.get(i) != color:
+                self.facecolors[i] = to_rgba(color)
+        self.colors = colors
+        self.bars.set_facecolor(self.facecolors)
+        self.bars.stale = True
+
+        self._grow_markers(len(markers))
+        for text, (i, symbol, color) in zip(self.markers, markers):
+            text.set_position((i, frame[i]))
+            text.set_text(symbol)
+            text.set_color(color)
+            text.set_visible(True)
+        for text in self.markers[len(markers):]:
+            text.set_visible(False)
+
+        self.title.set_text(title or '')
+        return self.artists
+
+
+def _expand(colors):
+    """
+    把颜色字典中以 range 为键的区间展开为逐个索引，后面的键覆盖前面的键。
+    """
+    if not any(isinstance(key, range) for key in colors):
+        return colors
+    expanded = {}
+    for key, color in colors.items():
+        if isinstance(key, range):
+            expanded.update(dict.fromkeys(key, color))
+        else:
+            expanded[key] = color
+    return expanded
+
+
+class ColumnRenderer:
+    """
+    大数组的按像素列聚合渲染器，每帧的开销只取决于列数（默认为坐标轴的像素宽度）。
+    """
+    def __init__(self, ax, data, color='blue', columns=None):
+        """
+        :param ax: Matplotlib 的 Axes 对象
+        :param data: 初始数组
+        :param color: 竖线的默认颜色
+        :param columns: 列数，默认为坐标轴的像素宽度，不超过元素个数
+        """
+        data = np.asarray(data)
+        n = len(data)
+        self.ax = ax
+        self.color = np.array(to_rgba(color))
+        width = max(int(ax.bbox.width), 1)
+        columns = max(min(columns or width, n), 1)
+        # 第 c 列包含元素 [bounds[c], bounds[c + 1])，列数不超过 n 时每列至少一个元素
+        self.bounds = np.linspace(0, n, columns + 1).round().astype(np.int64)
+        self.starts = self.bounds[:-1]
+        x = (self.bounds[:-1] + self.bounds[1:] - 1) / 2
+        self.envelope = np.zeros((columns, 2, 2))  # 从 0 到最大值
+        self.spread = np.zeros((columns, 2, 2))    # 从最小值到最大值
+        self.envelope[:, :, 0] = x[:, None]
+        self.spread[:, :, 0] = x[:, None]
+        # 线宽比列宽多一个像素（1 磅 = dpi / 72 像素），关闭抗锯齿，相邻竖线之间不会因取整出现缝隙
+        linewidth = (width / columns + 1) * 72 / ax.figure.dpi
+        self.colcolors = np.tile(self.color, (columns, 1))
+        self.bars = LineCollection(self.envelope, colors=self._faded(), linewidths=linewidth,
+                                   antialiaseds=False)
+        self.lines = LineCollection(self.spread, colors=self.colcolors, linewidths=linewidth,
+                                    antialiaseds=False)
+        ax.add_collection(self.bars)
+        ax.add_collection(self.lines)
+        ax.set_xlim(-1, max(n, 1))
+        if n:
+            ax.set_ylim(min(0, data.min()), data.max() + 1)
+        self._spans = False  # 上一帧是否给整列着过色
+        # 高亮的单个元素和标注都画成散点
+        self.points = ax.scatter([], [], s=20, zorder=3)
+        self.title = ax.text(0.02, 0.98, '', transform=ax.transAxes, ha='left', va='top')
+        self.artists = [self.bars, self.lines, self.points, self.title]
+
+    def _faded(self):
+        # 与白色混合的不透明浅色，相邻竖线重叠处不会变深
+        faded = self.colcolors.copy()
+        faded[:, :3] = 0.35 * faded[:, :3] + 0.65
+        return faded
+
+    def _column(self, i):
+        return int(np.searchsorted(self.bounds, i, side='right')) - 1
+
+    def draw(self, frame, colors=None, markers=(), title=None):
+        """
+        绘制一帧，参数与返回值同 BarRenderer.draw；标注只画成对应颜色的点，不显示符号。
+        """
+        frame = np.asarray(frame)
+        if len(frame):
+            low = np.minimum.reduceat(frame, self.starts)
+            high = np.maximum.reduceat(frame, self.starts)
+            self.envelope[:, 0, 1] = np.minimum(low, 0)
+            self.envelope[:, 1, 1] = np.maximum(high, 0)
+            self.spread[:, 0, 1] = low
+            self.spread[:, 1, 1] = high
+            # 两个 LineCollection 的各条路径与 envelope、spread 共享内存，原地修改即可
+            self.bars.stale = True
+            self.lines.stale = True
+
+        points, pointcolors = [], []
+        spans = []
+        for key, color in (colors or {}).items():
+            if isinstance(key, range):
+                if len(key):
+                    spans.append((self._column(key[0]), self._column(key[-1]), color))
+            else:
+                points.append(key)
+                pointcolors.append(color)
+        for i, _, color in markers:
+            points.append(i)
+            pointcolors.append(color)
+
+        if spans or self._spans:
+            self.colcolors[:] = self.color
+            for first, last, color in spans:
+                self.colcolors[first:last + 1] = to_rgba(color)
+            self.bars.set_color(self._faded())
+            self.lines.set_color(self.colcolors)
+            self._spans = bool(spans)
+
+        if points:
+            self.points.set_offsets(np.column_stack([points, frame[points]]))
+            self.points.set_facecolor(pointcolors)
+        else:
+            self.points.set_offsets(np.empty((0, 2)))
+        self.title.set_text(title or '')
+        return self.artists
+
+
+def make_renderer(ax, data, kind='auto'):
+    """
+    创建渲染器。
+
+    :param ax: Matplotlib 的 Axes 对象
+    :param data: 初始数组
+    :param kind: 'bars'（BarRenderer）、'columns'（ColumnRenderer），
+                 或 'auto'：元素数超过坐标轴的像素宽度时用 'columns'，否则用 'bars'
+    """
+    if kind == 'auto':
+        kind = 'bars' if len(data) <= ax.bbox.width else 'columns'
+    if kind == 'bars':
+        return BarRenderer(ax, data)
+    if kind == 'columns':
+        return ColumnRenderer(ax, data)
+    raise ValueError(f'未知的渲染方式: {kind}')
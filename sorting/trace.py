@@ -0,0 +1,593 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 排序过程的紧凑轨迹记录
+
+# 设计思路：
+# 原先每个可视化类在每一步都把整个数组复制一份追加到 frames 中，
+# 冒泡排序约产生 n²/2 帧、每帧 n 个元素，内存随 n 以 O(n³) 增长。
+# SortTrace 只保存一份初始快照，外加一个预分配的 NumPy 结构化数组，
+# 每一步只记录一条操作事件（操作类型、相关索引、写入的值、高亮索引和动作标签）。
+# 任意一帧都可以从快照出发按顺序重放事件得到，
+# 因此内存与步数成正比，而不是与 步数 × n 成正比。
+#
+# 每条事件对应动画中的一帧，帧的形式与原先 frames 列表中的元组保持一致：
+#   (数组, 高亮索引1, 高亮索引2, ..., [动作标签])
+# 因此各可视化类解析帧的代码无需改动即可直接使用。
+#
+# 向量化的算法（如 NumPy 引擎）一次改写整个缓冲区，用 assign 记录为一条 ASSIGN 事件，
+# 写入的整段数据另存在 blocks 中，事件里只保存其编号。
+# 插入类的算法把一段元素整体后移一位再写入一个元素，用 shift 记录为一条 SHIFT 事件，而不是逐个元素的写入。
+#
+# TraceStream 是流式版本：不保存事件，每记录一步立即生成帧，供边排序边播放使用。
+#
+# 事件数组超过内存上限（memory_limit）后自动转存到磁盘上的内存映射文件，轨迹长度不再受内存限制；
+# save/load 把轨迹保存为 .npy 文件，重新打开时以内存映射方式零拷贝读取，无需重新排序即可反复播放。
+#
+# 所有记录器都带有 SortStats 计数（比较、交换、元素写入、辅助空间峰值）。
+# 只需要计数时使用 SortCounter：接口与 SortTrace 相同，但不记录任何事件，每一步没有内存分配。
+#
+# 数据量很大时帧数可达数十万，decimate 在给定的帧数预算内挑选要播放的帧：
+# 阶段边界帧总是保留，只对中间的细粒度帧抽稀，播放时长和导出文件大小都有上限。
+#
+# 按顺序访问时，重放游标让每帧只需重放一条事件；跳转到前面的帧却要从初始快照重放。
+# build_keyframes 每隔 K 条事件保存一份缓冲区快照（关键帧），事件本身就是关键帧之间的增量，
+# 之后访问任意一帧都从不晚于它的最近关键帧（或更近的游标）出发，最多重放 K 条事件。
+# K 按关键帧的总字节数上限自动选取；从未用到辅助数组的轨迹只保存主数组。
+
+import json
+import os
+import tempfile
+import weakref
+from collections import deque
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+# 缓冲区编号
+MAIN = 0  # 待排序数组
+AUX = 1   # 辅助数组（如计数排序的输出数组），初始全为 0
+
+# 操作类型
+NOP = 0    # 不修改数组，仅记录高亮（比较、阶段标记等）
+SWAP = 1   # 交换 buf[p] 与 buf[q]
+WRITE = 2  # buf[p] = value
+FILL = 3   # dst[:] = value
+ASSIGN = 4  # dst[:] = blocks[p]
+SHIFT = 5   # buf[p + 1:q + 1] = buf[p:q]; buf[p] = value
+
+MAX_HIGHLIGHT = 3  # 每帧最多高亮的索引个数
+
+MEMORY_LIMIT = 256 * 2 ** 20  # 事件数组超过该字节数后转存到磁盘
+
+KEYFRAME_BYTES = 64 * 2 ** 20  # 关键帧占用的字节数上限
+MIN_KEYFRAME_INTERVAL = 256    # 关键帧之间最少的事件数
+
+
+@dataclass
+class SortStats:
+    """
+    排序过程的操作计数。
+    """
+    comparisons: int = 0  # 元素之间的比较次数
+    swaps: int = 0        # 交换次数
+    writes: int = 0       # 元素写入次数（包括写入辅助数组）
+    aux_bytes: int = 0    # 辅助空间的峰值字节数
+
+
+class SortCounter:
+    """
+    只统计操作次数、不记录帧的记录器，接口与 SortTrace 相同。
+
+    各排序算法在记录帧的同时调用 tally/alloc/free 补充不产生帧的操作，
+    因此无论是否记录轨迹，统计结果都是精确的。
+    """
+    # 是否记录帧；为 False 时排序算法不必每一步都调用记录器并 yield，
+    # 可以像 level='swaps' 那样在本地累加次数、整段 tally，以接近普通 Python 循环的速度运行
+    recording = False
+
+    def __init__(self, data):
+        self.stats = SortStats()
+        # 单个元素的字节数，用于统计辅助空间；只看首个元素，避免转换整个数组
+        self.itemsize = np.asarray(data[:1]).itemsize
+        self._aux = 0  # 当前占用的辅助空间字节数
+
+    def mark(self, *highlight, label=None, buf=MAIN):
+        """
+        记录一帧，不修改数组（如阶段标记）。
+        """
+
+    def compare(self, *highlight, label=None, buf=MAIN):
+        """
+        记录一次比较。
+        """
+        self.stats.comparisons += 1
+
+    def swap(self, p, q, *highlight, label=None, buf=MAIN):
+        """
+        记录交换 buf[p] 与 buf[q]，默认高亮 p 和 q。
+        """
+        self.stats.swaps += 1
+
+    def write(self, p, value, *highlight, label=None, buf=MAIN):
+        """
+        记录写入 buf[p] = value，默认高亮 p。
+        """
+        self.stats.writes += 1
+
+    def fill(self, value, *highlight, dst=AUX, label=None, buf=MAIN):
+        """
+        记录将缓冲区 dst 整体填充为 value（视为辅助数组的初始化，不计入写入次数）。
+        """
+
+    def assign(self, values, *highlight, label=None, buf=MAIN, writes=None):
+        """
+        记录将整段数据 values 写入缓冲区 buf（每个元素计一次写入）。
+
+        :param writes: 计入的写入次数，默认为 len(values)；values 只是示意（如外部排序的采样）时可另行指定
+        """
+        self.stats.writes += len(values) if writes is None else writes
+
+    def shift(self, p, q, value, *highlight, label=None, buf=MAIN):
+        """
+        记录将 buf[p:q] 整体后移一位、再写入 buf[p] = value（移动的每个元素和 value 各计一次写入）。
+        """
+        self.stats.writes += q - p + 1
+
+    def tally(self, comparisons=0, swaps=0, writes=0):
+        """
+        累加不产生帧的操作次数。
+        """
+        self.stats.comparisons += comparisons
+        self.stats.swaps += swaps
+        self.stats.writes += writes
+
+    def alloc(self, nbytes):
+        """
+        登记分配了 nbytes 字节的辅助空间。
+        """
+        self._aux += nbytes
+        if self._aux > self.stats.aux_bytes:
+            self.stats.aux_bytes = self._aux
+
+    def free(self, nbytes):
+        """
+        登记释放了 nbytes 字节的辅助空间。
+        """
+        self._aux -= nbytes
+
+
+class SortTrace(SortCounter):
+    """
+    排序轨迹，保存初始快照和操作事件，可按需重建任意一帧。
+
+    支持 len()、下标访问和迭代，可直接作为 FuncAnimation 的 frames 参数使用。
+    """
+    recording = True
+
+    def __init__(self, data, capacity=1024, memory_limit=None, spill_dir=None):
+        """
+        :param data: 待排序的初始数据
+        :param capacity: 预分配的事件数，不足时按倍数扩容
+        :param memory_limit: 事件数组在内存中的字节数上限，超过后转存到磁盘，默认为 MEMORY_LIMIT
+        :param spill_dir: 转存文件所在的目录，默认为系统临时目录
+        """
+        self.initial = np.array(data)  # 初始快照
+        self.stats = SortStats()
+        self.itemsize = self.initial.itemsize
+        self._aux = 0
+        self.dtype = np.dtype([
+            ('op', np.uint8),        # 操作类型
+            ('buf', np.uint8),       # 本帧显示（及 SWAP/WRITE 作用）的缓冲区
+            ('dst', np.uint8),       # FILL/ASSIGN 作用的缓冲区
+            ('arity', np.uint8),     # 高亮索引个数
+            ('label', np.uint8),     # 动作标签编号，0 表示无标签
+            ('p', np.int64),         # 操作数
+            ('q', np.int64),
+            ('value', self.initial.dtype),
+            ('highlight', np.int64, (MAX_HIGHLIGHT,)),
+        ])
+        self.memory_limit = MEMORY_LIMIT if memory_limit is None else memory_limit
+        self.spill_dir = spill_dir
+        self._spill = None  # 转存文件路径，仍在内存中时为 None
+        self._size = 0
+        self._events = self._allocate(max(int(capacity), 1))
+        self.labels = [None]  # 标签编号到标签字符串的映射
+        self._label_ids = {None: 0}
+        self.blocks = []      # ASSIGN 事件写入的整段数据
+        self._cursor = None   # 顺序访问时的重放游标：(已重放事件数, 缓冲区状态)
+        self._keyframes = None  # (关键帧间隔, 关键帧数组)，由 build_keyframes 创建
+
+    @property
+    def events(self):
+        """
+        已记录的事件（结构化数组视图）。
+        """
+        return self._events[:self._size]
+
+    @property
+    def nbytes(self):
+        """
+        轨迹占用的字节数（快照 + 已记录事件）。
+        """
+        return (self.initial.nbytes + self._size * self.dtype.itemsize
+                + sum(block.nbytes for block in self.blocks if block is not None))
+
+    def mark(self, *highlight, label=None, buf=MAIN):
+        """
+        记录一帧，不修改数组（如阶段标记）。
+        """
+        self._append(NOP, buf, MAIN, 0, 0, 0, highlight, label)
+
+    def compare(self, *highlight, label=None, buf=MAIN):
+        """
+        记录一次比较，本帧高亮参与比较的元素。
+        """
+        self.stats.comparisons += 1
+        self._append(NOP, buf, MAIN, 0, 0, 0, highlight, label)
+
+    def swap(self, p, q, *highlight, label=None, buf=MAIN):
+        """
+        记录交换 buf[p] 与 buf[q]，默认高亮 p 和 q。
+        """
+        self.stats.swaps += 1
+        self._append(SWAP, buf, buf, p, q, 0, highlight or (p, q), label)
+
+    def write(self, p, value, *highlight, label=None, buf=MAIN):
+        """
+        记录写入 buf[p] = value，默认高亮 p。
+        """
+        self.stats.writes += 1
+        self._append(WRITE, buf, buf, p, 0, value, highlight or (p,), label)
+
+    def fill(self, value, *highlight, dst=AUX, label=None, buf=MAIN):
+        """
+        记录将缓冲区 dst 整体填充为 value，本帧显示缓冲区 buf。
+        """
+        self._append(FILL, buf, dst, 0, 0, value, highlight, label)
+
+    def assign(self, values, *highlight, label=None, buf=MAIN, writes=None):
+        """
+        记录将整段数据 values 写入缓冲区 buf，本帧显示该缓冲区（writes 的含义同 SortCounter.assign）。
+        """
+        self.stats.writes += len(values) if writes is None else writes
+        self.blocks.append(np.array(values, dtype=self.initial.dtype))
+        self._append(ASSIGN, buf, buf, len(self.blocks) - 1, 0, 0, highlight, label)
+
+    def shift(self, p, q, value, *highlight, label=None, buf=MAIN):
+        """
+        记录将 buf[p:q] 整体后移一位、再写入 buf[p] = value，默认高亮 p 和 q。
+        """
+        self.stats.writes += q - p + 1
+        self._append(SHIFT, buf, buf, p, q, value, highlight or (p, q), label)
+
+    def _append(self, op, buf, dst, p, q, value, highlight, label):
+        if self._size == len(self._events):
+            self._grow()
+        self._events[self._size] = self._event(op, buf, dst, p, q, value, highlight, label)
+        self._size += 1
+
+    def _event(self, op, buf, dst, p, q, value, highlight, label):
+        """
+        构造一条事件记录（与结构化数组的字段顺序一致）。
+        """
+        if len(highlight) > MAX_HIGHLIGHT:
+            raise ValueError(f'每帧最多高亮 {MAX_HIGHLIGHT} 个索引')
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = self._label_ids[label] = len(self.labels)
+            self.labels.append(label)
+        padded = tuple(highlight) + (0,) * (MAX_HIGHLIGHT - len(highlight))
+        return (op, buf, dst, len(highlight), label_id, p, q, value, padded)
+
+    def _grow(self):
+        self._events = self._allocate(max(2 * len(self._events), 1024))
+
+    def _allocate(self, capacity):
+        """
+        分配能容纳 capacity 条事件的数组，并把已记录的事件移过去。
+
+        内存中最多预留 memory_limit 字节；已记录的事件把这部分占满后才改用磁盘上的内存映射文件，
+        预估的容量偏大不会让很短的轨迹转存到磁盘。转存后扩容只需加长文件，已有事件无需复制。
+        """
+        limit = max(self.memory_limit // self.dtype.itemsize, 1)  # 内存中最多容纳的事件数
+        if self._spill is None and self._size < limit:
+            capacity = min(capacity, limit)
+        elif self._spill is None:
+            fd, self._spill = tempfile.mkstemp(prefix='sorttrace-', suffix='.events', dir=self.spill_dir)
+            os.close(fd)
+            weakref.finalize(self, os.remove, self._spill)
+            old = self._events[:self._size] if self._size else None
+            events = np.memmap(self._spill, dtype=self.dtype, mode='r+', shape=(capacity,))
+            if old is not None:
+                events[:self._size] = old
+            return events
+        if self._spill is not None:
+            # r+ 模式下文件不够长时 numpy 会自动加长文件
+            return np.memmap(self._spill, dtype=self.dtype, mode='r+', shape=(capacity,))
+        events = np.zeros(capacity, dtype=self.dtype)
+        if self._size:
+            events[:self._size] = self._events[:self._size]
+        return events
+
+    @property
+    def spilled(self):
+        """
+        事件是否已转存到磁盘。
+        """
+        return self._spill is not None
+
+    def save(self, path, **meta):
+        """
+        把轨迹保存到目录 path 中（initial.npy、events.npy、meta.json，有整段写入时还有 blocks.npy），
+        之后可用 load 重新打开。
+
+        :param meta: 随轨迹一起保存的附加信息（需可序列化为 JSON）
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'initial.npy'), self.initial)
+        np.save(os.path.join(path, 'events.npy'), self.events)
+        if self.blocks:
+            # 各段都是整个缓冲区，长度相同，可以合成一个二维数组
+            np.save(os.path.join(path, 'blocks.npy'), np.stack(self.blocks))
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(dict(meta, labels=self.labels, stats=asdict(self.stats)), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        打开用 save 保存的轨迹。
+
+        :param mmap: 是否以只读内存映射方式打开事件数组（零拷贝，不占用内存）
+        :return: (轨迹, 附加信息)
+        """
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        events = np.load(os.path.join(path, 'events.npy'), mmap_mode='r' if mmap else None)
+        trace = cls.__new__(cls)
+        trace.initial = np.load(os.path.join(path, 'initial.npy'))
+        trace.stats = SortStats(**meta.pop('stats', {}))
+        trace.itemsize = trace.initial.itemsize
+        trace._aux = 0
+        trace.dtype = events.dtype
+        trace.memory_limit = MEMORY_LIMIT
+        trace.spill_dir = None
+        trace._spill = None
+        trace._events = events
+        trace._size = len(events)
+        trace.labels = meta.pop('labels')
+        trace._label_ids = {label: i for i, label in enumerate(trace.labels)}
+        blocks = os.path.join(path, 'blocks.npy')
+        trace.blocks = np.load(blocks, mmap_mode='r' if mmap else None) if os.path.exists(blocks) else []
+        trace._cursor = None
+        trace._keyframes = None
+        return trace, meta
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        state = self._initial_state()
+        for step in range(0, self._size, 4096):
+            for event in self.events[step:step + 4096].tolist():
+                self._apply(state, event)
+                yield self._frame(state, event)
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += self._size
+        if not 0 <= k < self._size:
+            raise IndexError('帧索引超出范围')
+        # 顺序访问时从上次的位置继续重放，否则从最近的关键帧（没有关键帧时从初始快照）开始
+        step, state = 0, None
+        if self._cursor is not None and self._cursor[0] <= k:
+            step, state = self._cursor
+        if self._keyframes is not None:
+            interval, keyframes = self._keyframes
+            j = k // interval
+            if state is None or step < j * interval:
+                step, state = j * interval, self._keyframe_state(keyframes[j])
+        if state is None:
+            state = self._initial_state()
+        for start in range(step, k, 4096):
+            for event in self._events[start:min(start + 4096, k)].tolist():
+                self._apply(state, event)
+        event = self._events[k].tolist()
+        self._apply(state, event)
+        self._cursor = (k + 1, state)
+        return self._frame(state, event)
+
+    def build_keyframes(self, interval=None, max_bytes=KEYFRAME_BYTES):
+        """
+        重放一遍整个轨迹，每隔 interval 条事件保存一个关键帧，之后可在 O(interval) 内访问任意一帧。
+
+        :param interval: 关键帧之间的事件数，默认按 max_bytes 自动选取，不少于 MIN_KEYFRAME_INTERVAL
+        :param max_bytes: 自动选取间隔时关键帧占用的字节数上限
+        :return: 实际使用的关键帧间隔
+        """
+        events = self.events
+        # 从未用到辅助数组的轨迹只保存主数组
+        buffers = 2 if ((events['buf'] == AUX) | (events['dst'] == AUX)).any() else 1
+        if interval is None:
+            count = max(max_bytes // max(buffers * self.initial.nbytes, 1), 1)
+            interval = max(-(-self._size // count), MIN_KEYFRAME_INTERVAL)
+        if interval < 1:
+            raise ValueError('关键帧间隔至少为 1')
+        # 第 j 个关键帧是重放前 j * interval 条事件之后的状态
+        keyframes = np.empty((max(-(-self._size // interval), 1), buffers, len(self.initial)),
+                             dtype=self.initial.dtype)
+        state = self._initial_state()
+        for j in range(len(keyframes)):
+            keyframes[j] = state[:buffers]
+            for start in range(j * interval, min((j + 1) * interval, self._size), 4096):
+                for event in events[start:min(start + 4096, (j + 1) * interval)].tolist():
+                    self._apply(state, event)
+        self._keyframes = (interval, keyframes)
+        return interval
+
+    def _keyframe_state(self, keyframe):
+        state = [buffer.copy() for buffer in keyframe]
+        if len(state) == 1:
+            state.append(np.zeros_like(self.initial))
+        return state
+
+    def decimate(self, max_frames, keep_labels=(), strategy='uniform'):
+        """
+        在帧数预算内挑选要播放的帧。
+
+        阶段边界帧（标签属于 keep_labels 的帧、标签发生切换的帧、首帧和末帧）总是保留，
+        其余的细粒度帧在剩余预算内抽取：
+        - 'uniform'：均匀抽取；
+        - 'importance'：优先保留修改数组的帧（交换、写入等），再均匀抽取只做比较的帧。
+        边界帧本身就超出预算时，对边界帧均匀抽取。
+
+        :param max_frames: 最多保留的帧数
+        :param keep_labels: 必须保留的阶段标签，如快速排序的 'partitioned'
+        :param strategy: 抽取方式，'uniform' 或 'importance'
+        :return: 保留的帧索引（升序）
+        """
+        if strategy not in ('uniform', 'importance'):
+            raise ValueError(f'未知的抽取方式: {strategy}')
+        if max_frames is None or self._size <= max_frames:
+            return np.arange(self._size)
+        if max_frames < 1:
+            raise ValueError('max_frames 至少为 1')
+
+        events = self.events
+        boundary = self.boundaries(keep_labels)
+        must = np.flatnonzero(boundary)
+        if len(must) >= max_frames:
+            return must[_spread(len(must), max_frames)]
+
+        budget = max_frames - len(must)
+        rest = np.flatnonzero(~boundary)
+        if strategy == 'importance':
+            mutating = events['op'][rest] != NOP
+            groups = [rest[mutating], rest[~mutating]]
+        else:
+            groups = [rest]
+        picked = [must]
+        for group in groups:
+            take = min(budget, len(group))
+            picked.append(group[_spread(len(group), take)])
+            budget -= take
+        return np.sort(np.concatenate(picked))
+
+    def boundaries(self, keep_labels=()):
+        """
+        阶段边界帧的掩码：标签属于 keep_labels 的帧、标签发生切换的帧、首帧和末帧。
+
+        :return: 长度为 len(self) 的布尔数组
+        """
+        labels = self.events['label']
+        boundary = np.isin(labels, [self._label_ids[label] for label in keep_labels if label in self._label_ids])
+        boundary[1:] |= labels[1:] != labels[:-1]
+        if self._size:
+            boundary[0] = boundary[-1] = True
+        return boundary
+
+    def select(self, indices):
+        """
+        返回只包含指定帧的轨迹视图，可直接作为 FuncAnimation 的 frames 参数使用。
+        """
+        return TraceSelection(self, indices)
+
+    def _initial_state(self):
+        return [self.initial.copy(), np.zeros_like(self.initial)]
+
+    def _apply(self, state, event):
+        """
+        将一条事件作用到缓冲区状态上。
+        """
+        op, buf, dst, _, _, p, q, value, _ = event
+        if op == SWAP:
+            arr = state[buf]
+            arr[p], arr[q] = arr[q], arr[p]
+        elif op == WRITE:
+            state[buf][p] = value
+        elif op == FILL:
+            state[dst][:] = value
+        elif op == ASSIGN:
+            state[dst][:] = self.blocks[p]
+        elif op == SHIFT:
+            arr = state[buf]
+            arr[p + 1:q + 1] = arr[p:q]  # NumPy 会正确处理重叠的切片
+            arr[p] = value
+
+    def _frame(self, state, event):
+        """
+        由当前状态和事件构造与原 frames 列表相同形式的帧元组。
+        """
+        _, buf, _, arity, label_id, _, _, _, highlight = event
+        frame = (state[buf].copy(),) + tuple(highlight[:arity])
+        label = self.labels[label_id]
+        return frame if label is None else frame + (label,)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # 序列化时丢弃未使用的预分配空间；转存文件随原对象删除，因此也读回内存
+        state['_events'] = np.array(self.events)
+        state['_spill'] = None
+        state['_cursor'] = None  # 关键帧随轨迹一起传输（如并行导出时送往各工作进程）
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+
+def _spread(total, count):
+    """
+    从 0 到 total - 1 中均匀选出 count 个不重复的位置（包含两端）。
+    """
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if count == 1:
+        return np.zeros(1, dtype=np.int64)
+    return np.unique(np.linspace(0, total - 1, count).round().astype(np.int64))
+
+
+class TraceSelection:
+    """
+    轨迹中按索引挑选出的部分帧，支持 len()、下标访问和迭代。
+    """
+    def __init__(self, trace, indices):
+        self.trace = trace
+        self.indices = np.asarray(indices, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, k):
+        return self.trace[int(self.indices[k])]
+
+    def __iter__(self):
+        # 索引升序时，SortTrace 的重放游标保证总重放量与原轨迹长度相同
+        for k in self.indices.tolist():
+            yield self.trace[k]
+
+
+class TraceStream(SortTrace):
+    """
+    流式轨迹，不保存事件历史：每记录一步就立即生成对应的帧，放入待播放缓冲区。
+
+    用于边排序边播放，内存只取决于缓冲区中尚未播放的帧数。
+    """
+    def __init__(self, data):
+        super().__init__(data, capacity=1)
+        self.pending = deque()  # 已生成但尚未播放的帧
+        self._state = self._initial_state()
+
+    def _append(self, op, buf, dst, p, q, value, highlight, label):
+        event = self._event(op, buf, dst, p, q, value, highlight, label)
+        self._apply(self._state, event)
+        if op == ASSIGN:
+            self.blocks[p] = None  # 已作用到当前状态上，不再需要保留
+        self.pending.append(self._frame(self._state, event))
+        self._size += 1
+
+    def __iter__(self):
+        raise TypeError('流式轨迹不保存历史，只能通过 pending 依次取出帧')
+
+    def __getitem__(self, k):
+        raise TypeError('流式轨迹不保存历史，只能通过 pending 依次取出帧')
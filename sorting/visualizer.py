@@ -0,0 +1,344 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 排序可视化基类
+
+# 设计思路：
+# 各排序算法都写成生成器，每记录一步（self.frames.mark/swap/write/...）就 yield 一次。
+# - 默认模式：在构造时一次性驱动生成器跑完，事件全部记录在 SortTrace 中，之后可反复播放。
+# - 流式模式（stream=True）：构造时不排序，播放时由 FuncAnimation 逐帧拉取，
+#   生成器只向前多跑 lookahead 步，生成的帧放在有界缓冲区中。
+#   第一帧的等待时间与数据规模无关，内存只取决于缓冲区大小而不是整个排序历史。
+# - 不记录模式（record=False）：只把算法当作普通排序使用，记录器换成 SortCounter，
+#   每一步不分配内存，只统计比较、交换、写入次数和辅助空间（self.stats），结果在 self.result 中。
+#   SortCounter.recording 为 False，各算法据此跳过逐步的记录器调用和 yield，在本地累加次数后整段 tally，
+#   运行速度接近同样写法的普通 Python 循环。
+# animate 从头到尾顺序播放（每一帧都画，绘制慢时整体变慢）；play 按真实时间播放，绘制跟不上时跳帧（见 playback.py）；
+# explore 打开带滑块的播放器，可暂停、单步和跳转到任意一帧（见 player.py）。
+# Matplotlib 及各绘图模块（render、export、playback、player）只在播放或导出时才导入，
+# 只排序、只统计或只保存轨迹时不承担 Matplotlib 数百毫秒的导入开销。
+# 默认模式的轨迹按 (算法类, 算法参数, 输入数据) 缓存（见 cache.py），同一组数据重复构造时直接取出轨迹，不再排序。
+# 数据量很大（或不在内存中）的排序（外部排序、并行排序）继承 SampledSortVisualizer，
+# 在完整的数据上排序，动画只显示等间隔采样位置上的当前值。
+
+import copy
+from collections import deque
+
+import numpy as np
+
+from .cache import TraceCache, default_cache
+from .trace import SortCounter, SortTrace, TraceStream
+
+SAMPLES = 512  # 采样显示时默认的采样位置数
+
+
+class SortVisualizer:
+    """
+    排序可视化基类，子类实现 _steps（排序步骤生成器）和 _style（一帧的绘制方案）。
+    """
+    init_title = None  # 动画开始前显示的标题
+    phase_labels = ()  # 阶段边界帧的标签，限制帧数时总是保留
+    cacheable = True   # 轨迹是否只由算法参数和输入数据决定，可以缓存
+
+    def __init__(self, data, stream=False, lookahead=64, memory_limit=None, spill_dir=None, record=True,
+                 cache=True):
+        """
+        :param data: 待排序的数组
+        :param stream: 是否边排序边播放（不预先记录整个排序过程）
+        :param lookahead: 流式模式下预先生成的最大帧数
+        :param memory_limit: 轨迹在内存中的字节数上限，超过后转存到磁盘（见 SortTrace）
+        :param spill_dir: 轨迹转存文件所在的目录
+        :param record: 是否记录排序过程；为 False 时只排序并统计操作次数，不能播放
+        :param cache: 轨迹缓存，True 为默认缓存（cache.default_cache），也可以传入 TraceCache，False 时不使用缓存
+        """
+        options = dict(self.__dict__)  # 子类在调用本方法之前设置的算法参数
+        self.data = self._prepare(data)
+        self.stream = stream
+        self.lookahead = lookahead
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.record = record
+        self.frames = None  # 流式模式在播放时才创建 TraceStream
+        self.stats = None   # 操作计数（SortStats）
+        self.result = None  # 排好序的数组
+        if not record:
+            counter = SortCounter(self.data)
+            self.result = self._run(counter)
+            self.stats = counter.stats
+        elif not stream:
+            self.frames, self.result = self._cached_record(cache, data, options)
+            self.stats = self.frames.stats
+
+    @classmethod
+    def from_trace(cls, path, mmap=True):
+        """
+        打开用 save_trace 保存的轨迹，不重新排序即可调用 animate/export 播放。
+
+        :param path: 轨迹目录
+        :param mmap: 是否以只读内存映射方式打开（零拷贝）
+        """
+        trace, meta = SortTrace.load(path, mmap=mmap)
+        algorithm = meta.get('algorithm')
+        if algorithm is not None and algorithm != cls.__name__:
+            raise ValueError(f'轨迹由 {algorithm} 生成，不能用 {cls.__name__} 播放')
+        visualizer = cls.__new__(cls)
+        visualizer.data = trace.initial.tolist()
+        visualizer.stream = False
+        visualizer.lookahead = 64
+        visualizer.memory_limit = None
+        visualizer.spill_dir = None
+        visualizer.record = True
+        visualizer.frames = trace
+        visualizer.stats = trace.stats
+        visualizer.result = None
+        return visualizer
+
+    def save_trace(self, path):
+        """
+        把记录下来的排序轨迹保存到目录 path，之后可用 from_trace 重新打开。
+        """
+        if self.frames is None:
+            raise ValueError('未记录排序过程（流式或不记录模式），无法保存轨迹')
+        self.frames.save(path, algorithm=type(self).__name__)
+
+    def _prepare(self, data):
+        """
+        返回保存在 self.data 中的初始数据（副本），默认转换为列表，逐元素的排序步骤在列表上最快。
+        """
+        return list(data)
+
+    def _record(self):
+        """
+        运行整个排序过程，返回 (记录下来的轨迹, 排好序的数组)。
+        """
+        # 事件数组从 SortTrace 的默认容量开始按倍数扩容，步数无需预估
+        trace = SortTrace(self.data, memory_limit=self.memory_limit, spill_dir=self.spill_dir)
+        return trace, self._run(trace)
+
+    def _cached_record(self, cache, data, options):
+        """
+        先在缓存中查找 (算法类, 算法参数, 输入数据) 对应的轨迹，没有时运行排序并放入缓存。
+        """
+        if cache is True:
+            cache = default_cache()
+        if not isinstance(cache, TraceCache) or not self.cacheable:
+            return self._record()
+        key = cache.key(type(self), options, data)
+        if key is None:
+            return self._record()
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        trace, result = self._record()
+        cache.put(key, trace, result)
+        return trace, result
+
+    def _run(self, recorder):
+        """
+        用给定的记录器运行整个排序过程，返回排好序的数组。
+        """
+        # 在副本上运行，不改变 self.frames
+        worker = copy.copy(self)
+        worker.frames = recorder
+        result = []
+
+        def steps():
+            result.append((yield from worker._steps()))
+
+        deque(steps(), maxlen=0)  # 驱动生成器跑完整个排序过程
+        return result[0]
+
+    def _steps(self):
+        """
+        返回排序步骤生成器，每记录一步 yield 一次，结束时返回排好序的数组。
+        """
+        raise NotImplementedError
+
+    def _style(self, frame_data):
+        """
+        返回一帧的绘制方案：(数组, {索引: 颜色}, [(索引, 标注符号, 颜色)], 标题)。
+        颜色字典的键也可以是 range，表示整个区间用同一种颜色高亮。
+        """
+        raise NotImplementedError
+
+    def _update(self, frame_data, renderer):
+        """
+        更新动画帧，返回需要重绘的图形元素（供 blit 使用）。
+        """
+        return renderer.draw(*self._style(frame_data))
+
+    def _stream_frames(self):
+        """
+        流式模式的帧生成器：按需推进排序，缓冲区中最多预存 lookahead 帧。
+        """
+        stream = TraceStream(self.data)
+        self.frames = stream
+        self.stats = stream.stats
+        # 在副本上运行排序生成器，保证同时存在的多个流互不干扰
+        worker = copy.copy(self)
+        worker.frames = stream
+        steps = worker._steps()
+        while True:
+            while steps is not None and len(stream.pending) < self.lookahead:
+                try:
+                    next(steps)
+                except StopIteration:
+                    steps = None
+            if not stream.pending:
+                return
+            yield stream.pending.popleft()
+
+    def _budget_frames(self, trace, max_frames, duration, fps, strategy):
+        """
+        按帧数预算（或目标时长 × 帧率）抽稀轨迹，保留阶段边界帧。
+        """
+        if duration is not None:
+            budget = max(int(duration * fps), 1)
+            max_frames = budget if max_frames is None else min(max_frames, budget)
+        if max_frames is None or len(trace) <= max_frames:
+            return trace
+        return trace.select(trace.decimate(max_frames, self.phase_labels, strategy))
+
+    def animate(self, max_frames=None, duration=None, strategy='uniform', interval=500, renderer='auto'):
+        """
+        运行动画，展示排序过程。
+
+        :param max_frames: 最多播放的帧数，超出时保留阶段边界帧、抽稀中间的细粒度帧
+        :param duration: 目标播放时长（秒），与 interval 一起换算为帧数上限
+        :param strategy: 抽稀方式，'uniform'（均匀）或 'importance'（优先保留修改数组的帧）
+        :param interval: 帧间隔（毫秒）
+        :param renderer: 渲染方式，'bars'、'columns' 或 'auto'（见 render.make_renderer）
+        """
+        if not self.record:
+            raise ValueError('未记录排序过程，无法播放')
+        if self.stream:
+            if max_frames is not None or duration is not None:
+                raise ValueError('流式模式下无法预先确定总帧数，不能限制帧数')
+            frames = self._stream_frames
+        else:
+            frames = self._budget_frames(self.frames, max_frames, duration, 1000 / interval, strategy)
+
+        import matplotlib.pyplot as plt
+        import matplotlib.animation as animation
+
+        from .render import make_renderer
+
+        fig, ax = plt.subplots()
+        renderer = make_renderer(ax, self.data, renderer)
+        ani = animation.FuncAnimation(fig, self._update, frames=frames,
+                                      init_func=lambda: renderer.draw(self.data, title=self.init_title),
+                                      fargs=(renderer,), interval=interval, repeat=False,
+                                      blit=True, cache_frame_data=False)
+        plt.show()
+
+    def play(self, speed=None, duration=None, fps=30, renderer='auto'):
+        """
+        按目标速度实时播放：绘制跟不上时跳过中间的帧（阶段边界帧总是显示），结束时打印实际帧率。
+
+        :param speed: 每秒播放的步数
+        :param duration: 目标播放时长（秒），与 speed 二选一
+        :param fps: 最高帧率
+        :param renderer: 渲染方式，'bars'、'columns' 或 'auto'（见 render.make_renderer）
+        :return: PlaybackReport
+        """
+        if not self.record or self.stream:
+            raise ValueError('实时播放需要预先记录完整的排序过程')
+        from .playback import AdaptivePlayback
+
+        return AdaptivePlayback(self, speed, duration, fps, renderer).show()
+
+    def explore(self, max_frames=None, strategy='uniform', interval=50, renderer='auto'):
+        """
+        打开交互式播放器：拖动滑块或用键盘播放、暂停、单步和跳转（按键见 player.py）。
+
+        :param max_frames: 最多保留的帧数，超出时按 strategy 抽稀（见 animate）
+        :param strategy: 抽稀方式，'uniform' 或 'importance'
+        :param interval: 播放时的帧间隔（毫秒）
+        :param renderer: 渲染方式，'bars'、'columns' 或 'auto'（见 render.make_renderer）
+        :return: SortPlayer 对象
+        """
+        if not self.record or self.stream:
+            raise ValueError('交互式播放需要预先记录完整的排序过程')
+        frames = self._budget_frames(self.frames, max_frames, None, 1, strategy)
+        self.frames.build_keyframes()  # 建立关键帧，跳转到任意一帧只需重放少量事件
+        from .player import SortPlayer
+
+        player = SortPlayer(self, frames, interval, renderer)
+        player.show()
+        return player
+
+    def export(self, path, fps=2, workers=None, max_frames=None, duration=None, strategy='uniform', **kwargs):
+        """
+        不打开窗口，把排序动画并行导出为 GIF 或 MP4 文件。
+
+        max_frames、duration、strategy 的含义同 animate（duration 按 fps 换算），
+        其余参数见 export.export。
+        """
+        if not self.record:
+            raise ValueError('未记录排序过程，无法导出')
+        target = self
+        if self.stream:
+            # 并行导出需要完整的帧序列
+            target = copy.copy(self)
+            target.stream = False
+            target.frames = self._record()[0]
+        frames = self._budget_frames(target.frames, max_frames, duration, fps, strategy)
+        from . import export
+
+        export.export(target, path, frames=frames, fps=fps, workers=workers, **kwargs)
+
+
+class SampledSortVisualizer(SortVisualizer):
+    """
+    采样显示的排序可视化基类：子类在完整的数据 self.source 上排序，
+    动画只显示等间隔采样位置（self.positions）上的当前值，每写入一段用 _show 记录一帧。
+    """
+    def __init__(self, source, samples=SAMPLES, **kwargs):
+        """
+        :param source: 待排序的完整数据（数组或 np.memmap）
+        :param samples: 动画中显示的采样位置数
+        :param kwargs: 其余参数见 SortVisualizer
+        """
+        self.source = source
+        n = len(source)
+        # 等间隔的采样位置（升序、不重复）
+        self.positions = np.unique(np.linspace(0, n - 1, min(samples, n)).round().astype(np.int64))
+        super().__init__(np.asarray(source[self.positions]), **kwargs)
+
+    def __copy__(self):
+        # _run 在浅拷贝上运行排序，拷贝必须保留 source（__getstate__ 会丢弃它）
+        clone = type(self).__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # 源数据和结果可能比内存大，播放和导出（送往工作进程）只需要采样
+        state['source'] = None
+        state['result'] = None
+        return state
+
+    def _prepare(self, data):
+        return np.array(data)  # 采样值保存为数组，_show 在其副本上逐段更新
+
+    def _span(self, start, stop):
+        """
+        返回落在 [start, stop) 中的采样位置的下标范围 (lo, hi)。
+        """
+        lo, hi = np.searchsorted(self.positions, [start, stop]).tolist()
+        return lo, hi
+
+    def _show(self, view, arr, start, stop, *highlight, label, origin=None):
+        """
+        登记 arr[start:stop] 已写入，更新 view（采样位置上的当前值）并记录一帧，
+        高亮从 origin（默认为 start）到 stop 的采样范围，highlight 为附加在其后的帧参数。
+        区间内没有采样位置时只计数，不记录帧。
+        """
+        lo, hi = self._span(start, stop)
+        if lo == hi:
+            self.frames.tally(writes=stop - start)
+            return
+        view[lo:hi] = arr[self.positions[lo:hi]]
+        first = lo if origin is None else int(np.searchsorted(self.positions, origin))
+        yield self.frames.assign(view, first, hi - 1, *highlight, label=label, writes=stop - start)
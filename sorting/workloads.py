@@ -0,0 +1,151 @@
+# Copyright (c) 2025 WangYibo <xtwyb@163.com>
+# 本代码采用 CC BY-NC-SA 4.0 协议，禁止商业用途（作者授权除外）
+# 详情参见项目根目录 LICENSE 文件
+# 编写日期: 2025-04-04
+# 代码描述: 排序测试数据（工作负载）生成器
+
+# 设计思路：
+# 各演示只用均匀分布的随机数，碰不到各算法真正的弱点：
+# - 有序、逆序、近乎有序的输入：快速排序选基准、插入排序和冒泡排序的提前结束；
+# - 大量重复值：划分方式是否会退化；
+# - 偏斜的分布（Zipf、指数分布）：桶排序的桶划分；
+# - 取值范围很宽的数据：计数排序的计数数组大小；
+# - 三数取中的“杀手”序列（Musser 构造）：专门让取首、中、尾三数中值的快速排序每次只分出两个元素，
+#   用来检验内省排序改用堆排序的保护。
+# 每种数据都由一次（或常数次）NumPy 向量化调用生成，没有逐元素的 Python 循环，
+# 生成 10⁷ 个元素只需几十到几百毫秒。
+# 所有生成器的签名都是 (rng, n, **参数)，rng 为 np.random.Generator，结果为 int64 数组，
+# 与 benchmark、命令行中按名字选择数据分布的方式一致；generate 按名字和种子生成。
+
+import numpy as np
+
+
+def random(rng, n):
+    """
+    1 到 n 之间均匀分布的随机整数（可能有重复）。
+    """
+    return rng.integers(1, n + 1, n)
+
+
+def sorted_(rng, n):
+    """
+    1, 2, ..., n。
+    """
+    return np.arange(1, n + 1)
+
+
+def reversed_(rng, n):
+    """
+    n, n - 1, ..., 1。
+    """
+    return np.arange(n, 0, -1)
+
+
+def nearly_sorted(rng, n, swaps=None):
+    """
+    有序序列上随机交换 swaps 对元素（各对互不重叠），默认交换 n / 100 对。
+    """
+    arr = np.arange(1, n + 1)
+    swaps = max(n // 100, 1) if swaps is None else swaps
+    swaps = min(swaps, n // 2)
+    if swaps:
+        pos = rng.choice(n, 2 * swaps, replace=False)
+        left, right = pos[:swaps], pos[swaps:]
+        arr[left], arr[right] = arr[right], arr[left]
+    return arr
+
+
+def few_unique(rng, n, unique=5):
+    """
+    只有 unique 种取值（1 到 unique）的随机序列，重复值很多。
+    """
+    return rng.integers(1, unique + 1, n)
+
+
+def organ_pipe(rng, n):
+    """
+    先升后降的“管风琴”序列：1, 2, ..., n/2, ..., 2, 1。
+    """
+    i = np.arange(n)
+    return np.minimum(i, n - 1 - i) + 1
+
+
+def sawtooth(rng, n, teeth=None):
+    """
+    锯齿序列：teeth 段（默认约 √n 段）依次重复的升序段。
+    """
+    teeth = max(int(np.sqrt(n)), 1) if teeth is None else max(teeth, 1)
+    period = max(-(-n // teeth), 1)
+    return np.arange(n) % period + 1
+
+
+def zipf(rng, n, a=1.5):
+    """
+    近似 Zipf 分布（幂律，P(X ≥ k) = k^(1 - a)）：1 出现得最多，少数取值极大，取值范围很宽。
+
+    rng.zipf 逐个做拒绝采样，10⁷ 个元素要一两秒；这里对 Pareto 分布取整，尾部与 Zipf 相同，快一个数量级。
+    """
+    values = np.floor(rng.pareto(a - 1, n) + 1)
+    return np.minimum(values, 2 ** 62).astype(np.int64)  # 极少数取值超出 int64 的范围
+
+
+def exponential(rng, n, scale=None):
+    """
+    指数分布取整后加 1，小值密集、大值稀疏，默认尺度为 n / 10。
+    """
+    scale = max(n / 10, 1) if scale is None else scale
+    return rng.exponential(scale, n).astype(np.int64) + 1
+
+
+def wide_range(rng, n, high=2 ** 40):
+    """
+    0 到 high 之间的随机整数，取值范围远大于元素个数。
+    """
+    return rng.integers(0, high, n)
+
+
+def median_of_3_killer(rng, n):
+    """
+    Musser 构造的三数取中杀手序列：取首、中、尾三数中值作基准的快速排序每次划分只分出两个元素。
+
+    构造要求长度是 4 的倍数；n 不是 4 的倍数时，末尾依次补上剩下的最大值。
+    """
+    k = n // 4 * 2
+    arr = np.empty(2 * k, dtype=np.int64)
+    # 1 起始的位置 i（i ≤ k）为奇数时 A[i] = i、A[i + 1] = k + i；对所有 i，A[k + i] = 2i
+    odd = np.arange(1, k + 1, 2)
+    arr[odd - 1] = odd
+    arr[odd] = k + odd
+    i = np.arange(1, k + 1)
+    arr[k + i - 1] = 2 * i
+    return np.concatenate([arr, np.arange(2 * k + 1, n + 1)])
+
+
+DISTRIBUTIONS = {
+    'random': random,
+    'sorted': sorted_,
+    'reversed': reversed_,
+    'few_unique': few_unique,
+    'nearly_sorted': nearly_sorted,
+    'organ_pipe': organ_pipe,
+    'sawtooth': sawtooth,
+    'zipf': zipf,
+    'exponential': exponential,
+    'wide_range': wide_range,
+    'median_of_3_killer': median_of_3_killer,
+}
+
+
+def generate(name, n, seed=None, **params):
+    """
+    按名字生成长度为 n 的测试数据。
+
+    :param name: 数据分布的名字，见 DISTRIBUTIONS
+    :param n: 元素个数
+    :param seed: 随机数种子，相同的种子生成相同的数据
+    :param params: 传给生成器的参数，如 nearly_sorted 的 swaps
+    :return: int64 数组
+    """
+    if name not in DISTRIBUTIONS:
+        raise ValueError(f'未知的数据分布: {name}')
+    return DISTRIBUTIONS[name](np.random.default_rng(seed), n, **params)